@@ -2,22 +2,264 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import random
 import os
+import mmap
+import struct
+import hashlib
+import tempfile
+from array import array
+from functools import lru_cache
 
 # ---------- File Handling ----------
+# jokes.txt.idx holds the byte offset of every joke line, so a joke can be read
+# from jokes.txt on demand instead of keeping them all in a list. jokes.txt
+# itself is never held open or mapped, since it may be edited while the app runs.
+INDEX_MAGIC = b"JOKEIDX3"
+# magic, jokes.txt mtime_ns, jokes.txt size, number of jokes, sha1 of the indexed contents
+# (padded so the offsets after it stay 8-byte aligned)
+INDEX_HEADER = struct.Struct("<8sQQQ20s4x")
+RELOAD_MS = 2000  # how often the GUI checks jokes.txt for changes
+
+
+def indexPath(filename):
+    return filename + ".idx"
+
+
+def indexLines(file, pos, offsets, keys, seen):
+    # Adds the offset and hash of every joke line from pos onwards, skipping exact duplicates
+    file.seek(pos)
+    for line in file:
+        joke = line.strip()
+        if b"?" in joke:
+            key = hash(joke)
+            if key not in seen:
+                seen.add(key)
+                offsets.append(pos)
+                keys.append(key)
+        pos += len(line)
+
+
+def hashLines(file, offsets):
+    # Hash of the line at each offset, from one pass over file (the offsets are ascending)
+    keys = array("q")
+    if not len(offsets):
+        return keys
+    pos = offsets[0]
+    file.seek(pos)
+    for line in file:
+        if pos == offsets[len(keys)]:
+            keys.append(hash(line.strip()))
+            if len(keys) == len(offsets):
+                break
+        pos += len(line)
+    return keys
+
+
+def hashPrefix(file, size):
+    # sha1 of the first size bytes of file
+    digest = hashlib.sha1()
+    file.seek(0)
+    while size > 0:
+        block = file.read(min(1 << 20, size))
+        if not block:
+            break
+        digest.update(block)
+        size -= len(block)
+    return digest
+
+
+def lineStart(file, end):
+    # Offset of the start of the line holding byte end - 1
+    pos = end
+    while pos > 0:
+        step = min(4096, pos)
+        pos -= step
+        file.seek(pos)
+        found = file.read(step).rfind(b"\n")
+        if found != -1:
+            return pos + found + 1
+    return 0
+
+
+def buildIndex(filename, size):
+    offsets, keys, seen = array("Q"), array("q"), set()
+    with open(filename, "rb") as file:
+        indexLines(file, 0, offsets, keys, seen)
+        digest = hashPrefix(file, size).digest()
+    return offsets, keys, seen, digest
+
+
+def saveIndex(filename, offsets, digest, stat):
+    header = INDEX_HEADER.pack(INDEX_MAGIC, stat.st_mtime_ns, stat.st_size, len(offsets), digest)
+    # Swapped in with os.replace, never written in place
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix=".jokes-", suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(header)
+            offsets.tofile(file)
+        os.replace(tmp_path, indexPath(filename))
+    except OSError:
+        pass
+
+
+def loadIndex(filename, stat):
+    # Returns (offsets, digest) if the saved index still matches jokes.txt; the
+    # offsets are a memoryview into the mapped index file
+    try:
+        with open(indexPath(filename), "rb") as file:
+            magic, mtime_ns, size, count, digest = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC or mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                return None
+            if count == 0:
+                return array("Q"), digest
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None
+    # A truncated or padded index is rebuilt rather than trusted
+    if len(data) != INDEX_HEADER.size + 8 * count:
+        return None
+    return memoryview(data)[INDEX_HEADER.size:].cast("Q"), digest
+
+
+class JokeStore:
+    """The jokes in jokes.txt, read one at a time through a line-offset index.
+
+    The index is built on the first run and saved next to the file, so later
+    starts only load the offsets, whatever the number of jokes. refresh()
+    picks up edits to the file, indexing only appended lines when the old
+    contents are unchanged (checked against their sha1).
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        # Hash of each joke, and the set of them for dropping duplicates; an
+        # index loaded from disk only builds these once a reload needs them
+        self.keys = None
+        self.seen = None
+        stat = os.stat(filename)
+        index = loadIndex(filename, stat)
+        if index is None:
+            self.offsets, self.keys, self.seen, self.digest = buildIndex(filename, stat.st_size)
+            saveIndex(filename, self.offsets, self.digest, stat)
+        else:
+            self.offsets, self.digest = index
+        self.stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def line(self, i):
+        # Opened per read, so the file is free to be rewritten (or truncated) at any time
+        with open(self.filename, "rb") as file:
+            file.seek(self.offsets[i])
+            return file.readline().strip()
+
+    def key(self, i):
+        return self.keys[i] if self.keys is not None else hash(self.line(i))
+
+    def read(self, i):
+        """(text, hash) of joke i, from a single read."""
+        line = self.line(i)
+        return line.decode("utf-8", errors="replace"), hash(line)
+
+    def refresh(self):
+        """Re-reads jokes.txt if it changed: returns "appended", "rescanned" or None."""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) == self.stamp:
+            return None
+        old_size = self.stamp[1]
+        with open(self.filename, "rb") as file:
+            appended = False
+            if stat.st_size > old_size:
+                digest = hashPrefix(file, old_size)
+                appended = digest.digest() == self.digest
+            if appended:
+                self.offsets = array("Q", self.offsets)  # a loaded index is a read-only view
+                if self.keys is None:
+                    self.keys = hashLines(file, self.offsets)
+                    self.seen = set(self.keys)
+                # An unfinished last line may have been continued, so index it again
+                pos = old_size
+                if old_size:
+                    file.seek(old_size - 1)
+                    if file.read(1) != b"\n":
+                        pos = lineStart(file, old_size)
+                        if self.offsets and self.offsets[-1] == pos:
+                            self.offsets.pop()
+                            self.seen.discard(self.keys.pop())
+                indexLines(file, pos, self.offsets, self.keys, self.seen)
+                file.seek(old_size)
+                digest.update(file.read(stat.st_size - old_size))
+                self.digest = digest.digest()
+        if not appended:
+            self.offsets, self.keys, self.seen, self.digest = buildIndex(self.filename, stat.st_size)
+        saveIndex(self.filename, self.offsets, self.digest, stat)
+        self.stamp = (stat.st_mtime_ns, stat.st_size)
+        return "appended" if appended else "rescanned"
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        return self.read(i)[0]
+
+
 def loadJokes(filename):
-    jokes = []
     try:
-        with open(filename, "r", encoding="utf-8") as file:
-            for line in file:
-                line = line.strip()
-                if "?" in line:
-                    jokes.append(line)
+        return JokeStore(filename)
     except FileNotFoundError:
         messagebox.showerror("Error", "❌ jokes.txt not found in folder.")
-    return jokes
+        return []
+
+
+class ShuffleBag:
+    """Picks joke numbers at random without repeating one until every joke has been told.
+
+    Each round is a shuffled array of every joke number (4 bytes a joke).
+    Jokes added mid-round are shuffled into the part not yet told.
+    """
+
+    def __init__(self, size, seed=None):
+        self.random = random.Random(seed)
+        self.last = None
+        self.reset(size)
+
+    def reset(self, size, untold=None):
+        """Starts over with size numbers; with untold, the current round only deals those."""
+        self.size = size
+        self.newRound(untold)
+
+    def newRound(self, numbers=None):
+        self.order = array("I", range(self.size) if numbers is None else numbers)
+        self.random.shuffle(self.order)
+        # Don't let a round start with the joke that ended the previous one
+        if len(self.order) > 1 and self.order[0] == self.last:
+            j = self.random.randrange(1, len(self.order))
+            self.order[0], self.order[j] = self.order[j], self.order[0]
+        self.pos = 0
+
+    def remaining(self):
+        return len(self.order) - self.pos
+
+    def grow(self, size):
+        """Adds numbers up to size to the bag without losing track of what has been told."""
+        for n in range(self.size, size):
+            self.order.append(n)
+            j = self.random.randrange(self.pos, len(self.order))
+            self.order[-1], self.order[j] = self.order[j], self.order[-1]
+        self.size = max(self.size, size)
+
+    def next(self):
+        if self.size == 0:
+            return None
+        if self.pos == len(self.order):
+            self.newRound()
+        self.last = self.order[self.pos]
+        self.pos += 1
+        return self.last
 
 
 # ---------- Joke Logic ----------
+@lru_cache(maxsize=1024)
 def splitJoke(joke):
     parts = joke.split("?")
     setup = parts[0].strip() + "?"
@@ -41,6 +283,8 @@ class JokeGUI:
 
         filename = os.path.join(script_folder, "jokes.txt")
         self.jokes = loadJokes(filename)
+        self.bag = ShuffleBag(len(self.jokes))
+        self.told = set()  # hashes of the jokes told this round, so a reload can't bring them back
 
         # Title
         tk.Label(
@@ -76,12 +320,41 @@ class JokeGUI:
         self.current_setup = ""
         self.current_punchline = ""
 
+        # Watch jokes.txt so new jokes show up without restarting
+        self.root.after(RELOAD_MS, self.checkJokes)
+
+    def checkJokes(self):
+        self.reloadJokes()
+        self.root.after(RELOAD_MS, self.checkJokes)
+
+    def reloadJokes(self):
+        if not isinstance(self.jokes, JokeStore):
+            return
+        change = self.jokes.refresh()
+        if change == "appended":
+            self.bag.grow(len(self.jokes))
+        elif change == "rescanned":
+            # Joke numbers have changed, so finish the round with the jokes not told yet
+            untold = [i for i in range(len(self.jokes)) if self.jokes.key(i) not in self.told]
+            self.bag.reset(len(self.jokes), untold)
+
     def showSetup(self):
+        # Pick up any edit since the last check (one os.stat) so the offsets match the file
+        self.reloadJokes()
         if not self.jokes:
             self.display.config(text="(No jokes available.)")
             return
 
-        joke = random.choice(self.jokes)
+        if self.bag.remaining() == 0:
+            self.told.clear()
+        try:
+            joke, key = self.jokes.read(self.bag.next())
+        except OSError:
+            joke = ""
+        if "?" not in joke:
+            self.display.config(text="(No jokes available.)")
+            return
+        self.told.add(key)
         self.current_setup, self.current_punchline = splitJoke(joke)
 
         self.display.config(text=self.current_setup)
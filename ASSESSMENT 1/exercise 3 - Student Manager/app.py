@@ -1,36 +1,396 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import os
+import sys
+import glob
+import heapq
+import hashlib
+import mmap
+import struct
+import tempfile
+from array import array
+from itertools import islice
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 
 # ---------- Data Handling ----------
 
-def load_students(filename):
-    students = []
+COURSEWORK_MAX = 20
+EXAM_MAX = 100
+TOTAL_MARKS = 3 * COURSEWORK_MAX + EXAM_MAX
+SEARCH_LIMIT = 50  # most matches listed in the student search popup
+VISIBLE_ROWS = 20  # rows the View All table shows (and creates) at a time
+
+# Parsed-scores cache written next to the score file: a fixed header, then the
+# numeric columns as raw blocks (overall first so the doubles are 8-byte
+# aligned) and the newline-joined IDs, names and load errors as utf-8.
+CACHE_MAGIC = b"SCORES01"
+CACHE_HEADER = struct.Struct("<8sQQ20sIIII")  # magic, source mtime_ns, size, sha1, students, ids/names/errors lengths
+CACHE_HEADER_SIZE = 64
+
+class Student:
+    """One student's record, built from the store only when it is displayed."""
+    __slots__ = ("id", "name", "coursework", "total_coursework", "exam", "overall", "grade", "cohort")
+
+    def __init__(self, student_id, name, coursework, total_coursework, exam, overall, grade, cohort=""):
+        self.id = student_id
+        self.name = name
+        self.coursework = coursework
+        self.total_coursework = total_coursework
+        self.exam = exam
+        self.overall = overall
+        self.grade = grade
+        self.cohort = cohort
+
+class CohortSummary:
+    """Partial aggregates for one cohort file, small enough to send back from a worker process."""
+    __slots__ = ("count", "total", "highest", "lowest", "distribution", "order")
+
+    def __init__(self, count, total, highest, lowest, distribution, order):
+        self.count = count
+        self.total = total
+        self.highest = highest
+        self.lowest = lowest
+        self.distribution = distribution
+        self.order = order  # the cohort's rows ascending by overall %
+
+class StudentStore:
+    """All students held column by column in compact arrays rather than a dict each."""
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.coursework = array("B")  # three marks per student, flattened
+        self.total_coursework = array("B")
+        self.exam = array("B")
+        self.overall = array("d")
+        self.grades = bytearray()
+        self.cohort = array("H")  # index into cohort_names for each student
+        self.cohort_names = []  # empty unless several cohort files were merged
+        self.cohort_starts = []  # first row of each cohort
+        self.summaries = []  # CohortSummary per cohort
+        self.summaries_version = None  # the version the summaries still describe
+        self.errors = []  # (line number, reason) for every line that was skipped
+        self.version = 0  # bumped on every change so cached statistics know when to recompute
+        self.id_index = {}  # student ID -> row
+        self._name_keys = []  # sorted lowercase name and surname keys
+        self._name_rows = array("I")  # row for each entry in _name_keys
+        self._id_keys = []  # sorted IDs, for prefix search
+        self._id_rows = array("I")
+        self._index_version = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return Student(self.ids[i], self.names[i], list(self.coursework[3 * i:3 * i + 3]),
+                       self.total_coursework[i], self.exam[i], self.overall[i], chr(self.grades[i]),
+                       self.cohort_names[self.cohort[i]] if self.cohort_names else "")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @classmethod
+    def from_columns(cls, ids, names, coursework, total_coursework, exam, overall, grades):
+        """Builds a store around existing columns (arrays or memoryviews) without copying them."""
+        students = cls()
+        students.ids = ids
+        students.names = names
+        students.coursework = coursework
+        students.total_coursework = total_coursework
+        students.exam = exam
+        students.overall = overall
+        students.grades = grades
+        students.cohort = array("H", [0]) * len(ids)
+        students.id_index = dict(zip(ids, range(len(ids))))
+        return students
+
+    def _make_writable(self):
+        # Columns mapped from a cache file are read-only; copy them the first time a student is added
+        if not isinstance(self.overall, array):
+            self.coursework = array("B", self.coursework)
+            self.total_coursework = array("B", self.total_coursework)
+            self.exam = array("B", self.exam)
+            self.overall = array("d", self.overall)
+            self.grades = bytearray(self.grades)
+
+    def add(self, student_id, name, coursework, exam, cohort=0):
+        self._make_writable()
+        total_coursework = sum(coursework)
+        overall = (total_coursework + exam) / TOTAL_MARKS * 100
+        self.id_index[student_id] = len(self.ids)
+        self.ids.append(student_id)
+        self.names.append(name)
+        self.coursework.extend(coursework)
+        self.total_coursework.append(total_coursework)
+        self.exam.append(exam)
+        self.overall.append(overall)
+        self.grades.append(ord(get_grade(overall)))
+        self.cohort.append(cohort)
+        self.version += 1
+
+    def add_cohort(self, name, columns, errors, summary):
+        """Appends a whole cohort parsed elsewhere, tagging its rows with the cohort name.
+
+        A student ID that appears in more than one cohort keeps pointing at its
+        first row; each later copy is kept but reported in errors.
+        """
+        self._make_writable()
+        ids, names, coursework, total_coursework, exam, overall, grades = columns
+        start = len(self)
+        self.cohort_starts.append(start)
+        self.cohort.extend(array("H", [len(self.cohort_names)]) * len(ids))
+        self.cohort_names.append(name)
+        id_index = self.id_index
+        for row, student_id in enumerate(ids, start):
+            first = id_index.setdefault(student_id, row)
+            if first != row:
+                other = self.cohort_names[self.cohort[first]]
+                self.errors.append((0, f"{name}: duplicate student ID {student_id} (first in {other})"))
+        self.ids.extend(ids)
+        self.names.extend(names)
+        self.coursework.extend(coursework)
+        self.total_coursework.extend(total_coursework)
+        self.exam.extend(exam)
+        self.overall.extend(overall)
+        self.grades.extend(grades)
+        self.errors.extend((line_no, f"{name}: {reason}") for line_no, reason in errors)
+        self.summaries.append(summary)
+        self.version += 1
+        self.summaries_version = self.version
+
+    def build_indexes(self):
+        """Sorts the name and ID keys used by search(); only redone after the store changes."""
+        if self._index_version == self.version:
+            return
+        # Each name is indexed from the start of every word so "wil" finds "Ava Williams"
+        keys = []
+        for row, name in enumerate(self.names):
+            name = name.lower()
+            keys.append((name, row))
+            start = name.find(" ")
+            while start != -1:
+                keys.append((name[start + 1:], row))
+                start = name.find(" ", start + 1)
+        keys.sort()
+        self._name_keys = [k for k, _ in keys]
+        self._name_rows = array("I", (row for _, row in keys))
+        ids = sorted(self.id_index.items())
+        self._id_keys = [k for k, _ in ids]
+        self._id_rows = array("I", (row for _, row in ids))
+        self._index_version = self.version
+
+    def find_id(self, student_id):
+        """Row of the student with this exact ID, or None."""
+        return self.id_index.get(student_id)
+
+    def search(self, query, limit=50):
+        """Rows of up to limit students whose ID or name starts with query.
+
+        An exact ID match comes first, then ID prefixes, then name and surname
+        prefixes. Each lookup is a binary search, so this stays fast however
+        many students are loaded.
+        """
+        query = query.strip()
+        if not query:
+            return list(range(min(limit, len(self))))
+        self.build_indexes()
+        rows = []
+        seen = set()
+
+        def collect(keys, key_rows, prefix):
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(rows) < limit and keys[i].startswith(prefix):
+                row = key_rows[i]
+                if row not in seen:
+                    seen.add(row)
+                    rows.append(row)
+                i += 1
+
+        exact = self.find_id(query)
+        if exact is not None:
+            seen.add(exact)
+            rows.append(exact)
+        collect(self._id_keys, self._id_rows, query)
+        collect(self._name_keys, self._name_rows, query.lower())
+        return rows
+
+def parse_score_line(line):
+    """Returns (id, name, coursework, exam) for one row; raises ValueError saying what is wrong."""
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) != 6:
+        raise ValueError(f"expected 6 fields, found {len(parts)}")
+    student_id, name = parts[0], parts[1]
+    if not student_id or not name:
+        raise ValueError("missing ID or name")
     try:
-        with open(filename, "r") as f:
-            lines = f.read().splitlines()
-            count = int(lines[0].strip())
-            for line in lines[1:]:
-                parts = line.strip().split(",")
-                student_id = parts[0].strip()
-                name = parts[1].strip()
-                coursework = list(map(int, parts[2:5]))
-                exam = int(parts[5].strip())
-                total_coursework = sum(coursework)
-                overall = (total_coursework + exam) / 160 * 100
-                grade = get_grade(overall)
-                students.append({
-                    "id": student_id,
-                    "name": name,
-                    "coursework": coursework,
-                    "total_coursework": total_coursework,
-                    "exam": exam,
-                    "overall": overall,
-                    "grade": grade
-                })
+        marks = [int(p) for p in parts[2:]]
+    except ValueError:
+        raise ValueError("marks must be whole numbers")
+    coursework, exam = marks[:3], marks[3]
+    if not all(0 <= m <= COURSEWORK_MAX for m in coursework) or not 0 <= exam <= EXAM_MAX:
+        raise ValueError("mark out of range")
+    return student_id, name, coursework, exam
+
+def iter_score_rows(f, chunk_size=10000, first_line=1):
+    """Lazily parses score lines, reading chunk_size lines at a time.
+
+    Yields (line number, row, error): row is parse_score_line's tuple for a
+    good line, otherwise None and the reason. Blank lines are skipped.
+    """
+    line_no = first_line - 1
+    while True:
+        chunk = list(islice(f, chunk_size))
+        if not chunk:
+            return
+        for line in chunk:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                yield line_no, parse_score_line(line), None
+            except ValueError as e:
+                yield line_no, None, str(e)
+
+def file_digest(filename):
+    h = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+def cache_path(filename):
+    return filename + ".cache"
+
+def load_cache(filename):
+    """Returns the StudentStore cached for filename, or None if there is no up-to-date cache.
+
+    A matching mtime and size is trusted as is; if only the mtime differs
+    (the file was touched or copied) the contents are hashed and compared
+    before the cache is used. The numeric columns are memoryviews straight
+    into the mapped file, so nothing is parsed or copied.
+    """
+    path = cache_path(filename)
+    try:
+        source = os.stat(filename)
+        with open(path, "rb") as f:
+            header = f.read(CACHE_HEADER_SIZE)
+            if len(header) != CACHE_HEADER_SIZE:
+                return None
+            magic, mtime_ns, size, digest, count, ids_len, names_len, errors_len = CACHE_HEADER.unpack_from(header)
+            if magic != CACHE_MAGIC or size != source.st_size:
+                return None
+            if mtime_ns != source.st_mtime_ns:
+                if file_digest(filename) != digest:
+                    return None
+                # Same contents: record the new mtime so the next start skips the hash
+                try:
+                    with open(path, "r+b") as out:
+                        out.write(CACHE_HEADER.pack(magic, source.st_mtime_ns, size, digest, count,
+                                                    ids_len, names_len, errors_len))
+                except OSError:
+                    pass
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) != CACHE_HEADER_SIZE + 14 * count + ids_len + names_len + errors_len:
+        return None
+
+    view = memoryview(data)
+    pos = CACHE_HEADER_SIZE
+
+    def take(length):
+        nonlocal pos
+        block = view[pos:pos + length]
+        pos += length
+        return block
+
+    overall = take(8 * count).cast("d")
+    coursework = take(3 * count)
+    total_coursework = take(count)
+    exam = take(count)
+    grades = take(count)
+    # A damaged text block is just a cache miss; the caller re-parses and rewrites the cache
+    try:
+        ids = take(ids_len).tobytes().decode("utf-8").split("\n") if count else []
+        names = take(names_len).tobytes().decode("utf-8").split("\n") if count else []
+        if len(ids) != count or len(names) != count:
+            return None
+        errors = []
+        for line in take(errors_len).tobytes().decode("utf-8").splitlines():
+            line_no, reason = line.split("\t", 1)
+            errors.append((int(line_no), reason))
+    except ValueError:
+        return None
+
+    students = StudentStore.from_columns(ids, names, coursework, total_coursework, exam, overall, grades)
+    students.errors = errors
+    return students
+
+def save_cache(filename, students, source, digest):
+    """Writes students' columns to filename's cache; source and digest describe the parsed file."""
+    path = cache_path(filename)
+    ids = "\n".join(students.ids).encode("utf-8")
+    names = "\n".join(students.names).encode("utf-8")
+    errors = "".join(f"{line_no}\t{reason}\n" for line_no, reason in students.errors).encode("utf-8")
+    header = CACHE_HEADER.pack(CACHE_MAGIC, source.st_mtime_ns, source.st_size, digest, len(students),
+                               len(ids), len(names), len(errors)).ljust(CACHE_HEADER_SIZE, b"\0")
+    # Built in a temp file first; os.replace makes the switch atomic
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".scores-", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            for block in (header, students.overall, students.coursework, students.total_coursework,
+                          students.exam, students.grades, ids, names, errors):
+                f.write(block)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def read_students(filename, chunk_size=10000, use_cache=True):
+    """Loads a score file into a StudentStore; raises OSError if it cannot be read.
+
+    The store comes back without its search indexes (the first search() sorts
+    them), so cohort workers never build indexes that are thrown away.
+    """
+    if use_cache:
+        students = load_cache(filename)
+        if students is not None:
+            return students
+
+    students = StudentStore()
+    # Stat and hash before parsing, so a file edited mid-parse never matches its cache
+    source = os.stat(filename)
+    digest = file_digest(filename) if use_cache else None
+    with open(filename, "r") as f:
+        # The optional first-line student count is only a hint, checked at the end
+        first = f.readline()
+        if first.strip().isdigit():
+            expected, first_line = int(first), 2
+        else:
+            f.seek(0)
+            expected, first_line = None, 1
+
+        for line_no, row, error in iter_score_rows(f, chunk_size, first_line):
+            if error:
+                students.errors.append((line_no, error))
+            elif row[0] in students.id_index:
+                students.errors.append((line_no, f"duplicate student ID {row[0]}"))
+            else:
+                students.add(*row)
+
+        if expected is not None and expected != len(students):
+            students.errors.append((1, f"header says {expected} students but {len(students)} were loaded"))
+    if use_cache:
+        save_cache(filename, students, source, digest)
+    return students
+
+def load_students(filename, chunk_size=10000, use_cache=True):
+    try:
+        return read_students(filename, chunk_size, use_cache)
     except FileNotFoundError:
         messagebox.showerror("Error", f"File '{filename}' not found.")
-    return students
+        return StudentStore()
 
 def get_grade(percent):
     if percent >= 70: return "A"
@@ -39,31 +399,297 @@ def get_grade(percent):
     elif percent >= 40: return "D"
     else: return "F"
 
-def get_summary(students):
-    if not students:
+class StudentStats:
+    """Class statistics over a StudentStore.
+
+    Everything is computed together in a few passes over the columns and
+    cached until the store's version changes, so repeated button presses are
+    just lookups. A store merged from several cohorts is summarised from the
+    cohorts' partial aggregates instead of being scanned again.
+    """
+
+    def __init__(self, students):
+        self.students = students
+        self._version = None
+
+    def refresh(self):
+        students = self.students
+        if self._version == students.version:
+            return
+        self._order = None
+        self.orders = {}
+        self.from_cohorts = bool(students.summaries) and students.summaries_version == students.version
+        if self.from_cohorts:
+            self._merge_cohorts()
+        else:
+            self._scan()
+        self.average = self.total / self.count if self.count else 0.0
+        self._version = students.version
+
+    def _scan(self):
+        students = self.students
+        overall = students.overall
+        self.count = len(overall)
+        self.total = sum(overall)
+        if self.count:
+            self.highest_index = max(range(self.count), key=overall.__getitem__)
+            self.lowest_index = min(range(self.count), key=overall.__getitem__)
+        else:
+            self.highest_index = self.lowest_index = None
+        grades = bytes(students.grades)  # the column may be a memoryview, which has no count()
+        self.distribution = {grade: grades.count(ord(grade)) for grade in "ABCDF"}
+
+    def _merge_cohorts(self):
+        students = self.students
+        summaries = students.summaries
+        self.count = sum(s.count for s in summaries)
+        self.total = sum(s.total for s in summaries)
+        self.distribution = {grade: sum(s.distribution[grade] for s in summaries) for grade in "ABCDF"}
+        # Each cohort's best and worst row, shifted to where the cohort starts in the merged store
+        parts = [(start, s) for start, s in zip(students.cohort_starts, summaries) if s.count]
+        if parts:
+            overall = students.overall
+            self.highest_index = max((start + s.highest for start, s in parts), key=overall.__getitem__)
+            self.lowest_index = min((start + s.lowest for start, s in parts), key=overall.__getitem__)
+        else:
+            self.highest_index = self.lowest_index = None
+
+    def summary(self):
+        """These statistics as a CohortSummary, for merging into a multi-cohort store."""
+        self.refresh()
+        return CohortSummary(self.count, self.total, self.highest_index, self.lowest_index,
+                             self.distribution, self.overall_order())
+
+    def overall_order(self):
+        """Row indexes ascending by overall %, built the first time they are needed."""
+        self.refresh()
+        if self._order is None:
+            students = self.students
+            if self.from_cohorts:
+                # Each cohort's order is already sorted, so merging them replaces a full sort
+                runs = [map(start.__add__, s.order) for start, s in zip(students.cohort_starts, students.summaries)]
+                self._order = array("I", heapq.merge(*runs, key=students.overall.__getitem__))
+            else:
+                self._order = array("I", sorted(range(self.count), key=students.overall.__getitem__))
+            self.orders["overall"] = self._order
+        return self._order
+
+    def highest(self):
+        self.refresh()
+        return self.highest_index
+
+    def lowest(self):
+        self.refresh()
+        return self.lowest_index
+
+    def percentile(self, p):
+        """Overall % at percentile p (0-100), interpolating between neighbouring students."""
+        self.refresh()
+        if not self.count:
+            return None
+        order = self.overall_order()
+        pos = (self.count - 1) * p / 100
+        lower = int(pos)
+        upper = min(lower + 1, self.count - 1)
+        overall = self.students.overall
+        low, high = overall[order[lower]], overall[order[upper]]
+        return low + (high - low) * (pos - lower)
+
+    def _cohort_candidates(self, k, best):
+        # The global best (or worst) k are among each cohort's own best (or worst) k
+        students = self.students
+        rows = []
+        for start, s in zip(students.cohort_starts, students.summaries):
+            part = s.order[max(s.count - k, 0):] if best else s.order[:k]
+            rows.extend(start + row for row in part)
+        return rows
+
+    def top(self, k):
+        """Indexes of the k best students, best first."""
+        self.refresh()
+        if self.from_cohorts and self._order is None:
+            return heapq.nlargest(k, self._cohort_candidates(k, True), key=self.students.overall.__getitem__)
+        order = self.overall_order()
+        return list(reversed(order[max(self.count - k, 0):]))
+
+    def bottom(self, k):
+        """Indexes of the k weakest students, weakest first."""
+        self.refresh()
+        if self.from_cohorts and self._order is None:
+            return heapq.nsmallest(k, self._cohort_candidates(k, False), key=self.students.overall.__getitem__)
+        return list(self.overall_order()[:k])
+
+    def sorted_order(self, column):
+        """Row indexes ascending by "overall", "exam" or "grade", sorted once per store version."""
+        order = self.overall_order()
+        if column not in self.orders:
+            values = self.students.exam if column == "exam" else self.students.grades
+            # Sorting the overall order keeps ties (same exam mark or grade) in overall order
+            self.orders[column] = array("I", sorted(order, key=values.__getitem__))
+        return self.orders[column]
+
+    def grade_distribution(self):
+        self.refresh()
+        return self.distribution
+
+def get_summary(stats):
+    if not stats.students:
         return "No students loaded."
-    avg = sum(s["overall"] for s in students) / len(students)
-    return f"Number of students: {len(students)}\nClass average: {avg:.2f}%"
+    stats.refresh()
+    distribution = ", ".join(f"{grade}: {n}" for grade, n in stats.grade_distribution().items())
+    summary = (f"Number of students: {stats.count}\nClass average: {stats.average:.2f}%\n"
+               f"Median: {stats.percentile(50):.2f}%\nGrades: {distribution}")
+    students = stats.students
+    if len(students.cohort_names) > 1 and stats.from_cohorts:
+        averages = ", ".join(f"{name}: {s.total / s.count:.1f}%" if s.count else f"{name}: -"
+                             for name, s in zip(students.cohort_names, students.summaries))
+        summary += f"\nCohorts ({len(students.cohort_names)}): {averages}"
+    return summary
+
+def parse_cohort(filename):
+    """Process-pool worker: loads one score file and returns (columns, errors, CohortSummary).
 
-def get_highest_student(students):
-    return max(students, key=lambda s: s["overall"])
+    The columns come back as arrays and lists because memoryviews into a
+    cache file cannot be pickled. Errors are raised back to the parent
+    process, which reports them; a worker never opens a dialog.
+    """
+    students = read_students(filename)
+    columns = (students.ids, students.names, array("B", students.coursework), array("B", students.total_coursework),
+               array("B", students.exam), array("d", students.overall), bytearray(students.grades))
+    return columns, students.errors, StudentStats(students).summary()
 
-def get_lowest_student(students):
-    return min(students, key=lambda s: s["overall"])
+def find_score_files(path):
+    """Score files for a directory (every *.txt in it) or a glob pattern, in name order."""
+    if os.path.isdir(path):
+        path = os.path.join(path, "*.txt")
+    return sorted(f for f in glob.glob(path) if os.path.isfile(f) and not f.endswith(".cache"))
+
+def merge_cohorts(files, results):
+    """One StudentStore from parse_cohort's results, each cohort named after its file."""
+    students = StudentStore()
+    for filename, (columns, errors, summary) in zip(files, results):
+        students.add_cohort(os.path.splitext(os.path.basename(filename))[0], columns, errors, summary)
+    return students
+
+def load_cohorts(path, max_workers=None):
+    """Loads every score file matched by path, parsing them in parallel worker processes.
+
+    Raises FileNotFoundError if path matches no score files.
+    """
+    files = find_score_files(path)
+    if not files:
+        raise FileNotFoundError(f"No score files match '{path}'.")
+    if len(files) > 1:
+        with ProcessPoolExecutor(max_workers) as pool:
+            results = list(pool.map(parse_cohort, files))
+    else:
+        results = [parse_cohort(f) for f in files]
+    return merge_cohorts(files, results)
+
+def get_highest_student(stats):
+    return stats.students[stats.highest()]
+
+def get_lowest_student(stats):
+    return stats.students[stats.lowest()]
 
 # ---------- GUI ----------
 
+class RecordTable(tk.Frame):
+    """A Treeview of student records that only ever holds the visible rows.
+
+    The scrollbar is driven by hand: scrolling moves an offset into the store
+    (or into one of the stats' sort orders) and the few visible rows are
+    refilled from the columns, so the table costs the same for any cohort size.
+    """
+
+    COLUMNS = ("id", "name", "coursework", "exam", "overall", "grade")
+    HEADINGS = ("ID", "Name", "Coursework", "Exam", "Overall %", "Grade")
+    SORTABLE = ("exam", "overall", "grade")
+
+    def __init__(self, master, students, stats):
+        super().__init__(master)
+        self.students = students
+        self.stats = stats
+        self.offset = 0
+        self.sort_column = None  # None means file order
+        self.descending = False
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=VISIBLE_ROWS)
+        for column, heading in zip(self.COLUMNS, self.HEADINGS):
+            if column in self.SORTABLE:
+                self.tree.heading(column, text=heading, command=lambda c=column: self.sort_by(c))
+            else:
+                self.tree.heading(column, text=heading)
+            self.tree.column(column, width=180 if column == "name" else 90, anchor="w" if column == "name" else "center")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.summary = tk.Label(self, justify="left", anchor="w", wraplength=640)
+
+        self.summary.pack(side="bottom", fill="x", padx=5, pady=5)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset - e.delta // 120 * 3))
+            widget.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+            widget.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+
+    def row_at(self, position):
+        if self.sort_column is None:
+            return position
+        order = self.stats.sorted_order(self.sort_column)
+        # Descending just reads the ascending order backwards
+        return order[len(order) - 1 - position] if self.descending else order[position]
+
+    def refresh(self):
+        """Redraws the visible rows, the scrollbar and the summary."""
+        students = self.students
+        total = len(students)
+        self.offset = max(0, min(self.offset, total - VISIBLE_ROWS))
+        self.tree.delete(*self.tree.get_children())
+        for position in range(self.offset, min(self.offset + VISIBLE_ROWS, total)):
+            row = self.row_at(position)
+            self.tree.insert("", "end", values=(
+                students.ids[row], students.names[row], " ".join(map(str, students.coursework[3 * row:3 * row + 3])),
+                students.exam[row], f"{students.overall[row]:.2f}", chr(students.grades[row])))
+        if total:
+            self.scrollbar.set(self.offset / total, min(self.offset + VISIBLE_ROWS, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.summary.config(text=get_summary(self.stats))
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.students)))
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(amount) * VISIBLE_ROWS)
+        else:
+            self.scroll_to(self.offset + int(amount))
+
+    def sort_by(self, column):
+        """Sorts by column, highest first; clicking the same heading again flips the direction."""
+        if self.sort_column == column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            # Grade letters sort A first, so "best first" is ascending for grades
+            self.descending = column != "grade"
+        for c, heading in zip(self.COLUMNS, self.HEADINGS):
+            if c in self.SORTABLE:
+                arrow = (" \u25bc" if self.descending else " \u25b2") if c == column else ""
+                self.tree.heading(c, text=heading + arrow)
+        self.scroll_to(0)
+
+
 class StudentManager:
-    def __init__(self, root):
+    def __init__(self, root, path=None):
         self.root = root
         root.title("Student Manager")
         root.geometry("700x500")
 
-        # Load students
-        script_folder = os.path.dirname(__file__) if "__file__" in globals() else os.getcwd()
-        filename = os.path.join(script_folder, "scores.txt")
-        self.students = load_students(filename)
-
         # Main menu buttons
         btn_frame = tk.Frame(root)
         btn_frame.pack(pady=10)
@@ -72,60 +698,148 @@ class StudentManager:
         tk.Button(btn_frame, text="View Individual", width=20, command=self.view_individual).grid(row=0, column=1, padx=5)
         tk.Button(btn_frame, text="Highest Score", width=20, command=self.highest_student).grid(row=1, column=0, padx=5, pady=5)
         tk.Button(btn_frame, text="Lowest Score", width=20, command=self.lowest_student).grid(row=1, column=1, padx=5, pady=5)
+        tk.Button(btn_frame, text="Load Cohorts", width=20, command=self.choose_cohorts).grid(row=2, column=0, columnspan=2)
 
-        # Text area for displaying results
+        # Text area for single records; View All swaps in the record table instead
         self.text = tk.Text(root, width=85, height=25)
         self.text.pack(pady=10)
+        self.table = RecordTable(root, StudentStore(), None)
+
+        # Load students: a directory or glob of cohort files if one was given, otherwise scores.txt
+        if path:
+            try:
+                students = load_cohorts(path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not load cohorts: {e}")
+                students = StudentStore()
+            self.set_students(students)
+        else:
+            script_folder = os.path.dirname(__file__) if "__file__" in globals() else os.getcwd()
+            self.set_students(load_students(os.path.join(script_folder, "scores.txt")))
+
+    def set_students(self, students):
+        self.students = students
+        self.stats = StudentStats(students)
+        self.table.students = students
+        self.table.stats = self.stats
+        self.table.offset = 0
+        if students.errors:
+            # Line 0 marks a problem with no single line, such as an ID repeated across cohorts
+            report = "\n".join(f"Line {line_no}: {reason}" if line_no else reason
+                               for line_no, reason in students.errors[:10])
+            if len(students.errors) > 10:
+                report += f"\n...and {len(students.errors) - 10} more"
+            messagebox.showwarning("Some records were skipped", report)
+
+    def choose_cohorts(self):
+        folder = filedialog.askdirectory(title="Folder of cohort score files")
+        if not folder:
+            return
+        files = find_score_files(folder)
+        if not files:
+            messagebox.showinfo("Load Cohorts", "No .txt score files in that folder.")
+            return
+        # Parse in worker processes and poll for the results so the window stays responsive
+        pool = ProcessPoolExecutor()
+        futures = [pool.submit(parse_cohort, f) for f in files]
+        pool.shutdown(wait=False)
+        self.show_text()
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, f"Loading {len(files)} cohort files...\n")
+        self.root.after(100, self.poll_cohorts, files, futures)
+
+    def poll_cohorts(self, files, futures):
+        if not all(f.done() for f in futures):
+            self.root.after(100, self.poll_cohorts, files, futures)
+            return
+        self.text.delete(1.0, tk.END)
+        try:
+            results = [f.result() for f in futures]
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load cohorts: {e}")
+            return
+        self.set_students(merge_cohorts(files, results))
+        self.view_all()
+
+    def show_text(self):
+        self.table.pack_forget()
+        self.text.pack(pady=10)
 
     def display_student(self, s):
-        self.text.insert(tk.END, f"Name: {s['name']}\n")
-        self.text.insert(tk.END, f"ID: {s['id']}\n")
-        self.text.insert(tk.END, f"Coursework: {s['coursework']} (Total: {s['total_coursework']})\n")
-        self.text.insert(tk.END, f"Exam: {s['exam']}\n")
-        self.text.insert(tk.END, f"Overall %: {s['overall']:.2f}\n")
-        self.text.insert(tk.END, f"Grade: {s['grade']}\n")
+        self.text.insert(tk.END, f"Name: {s.name}\n")
+        self.text.insert(tk.END, f"ID: {s.id}\n")
+        if s.cohort:
+            self.text.insert(tk.END, f"Cohort: {s.cohort}\n")
+        self.text.insert(tk.END, f"Coursework: {s.coursework} (Total: {s.total_coursework})\n")
+        self.text.insert(tk.END, f"Exam: {s.exam}\n")
+        self.text.insert(tk.END, f"Overall %: {s.overall:.2f}\n")
+        self.text.insert(tk.END, f"Grade: {s.grade}\n")
         self.text.insert(tk.END, "-"*50 + "\n")
 
     def view_all(self):
-        self.text.delete(1.0, tk.END)
-        for s in self.students:
-            self.display_student(s)
-        self.text.insert(tk.END, get_summary(self.students) + "\n")
+        self.text.pack_forget()
+        self.table.pack(fill="both", expand=True, padx=10, pady=10)
+        self.table.refresh()
 
     def view_individual(self):
         if not self.students:
             return
+        self.show_text()
         self.text.delete(1.0, tk.END)
 
-        # Popup window for selection
+        # Popup window for selection: type an ID or name, only the matches are listed
         popup = tk.Toplevel()
         popup.title("Select Student")
-        tk.Label(popup, text="Select student:").pack(pady=5)
-        combo = ttk.Combobox(popup, values=[f"{s['id']} - {s['name']}" for s in self.students], width=40)
-        combo.pack(pady=5)
-        combo.current(0)
-
-        def show_selected():
-            sel = combo.get()
-            student_id = sel.split("-")[0].strip()
-            student = next(s for s in self.students if s["id"] == student_id)
+        tk.Label(popup, text="Search by ID or name:").pack(pady=5)
+        query = tk.StringVar()
+        entry = tk.Entry(popup, textvariable=query, width=40)
+        entry.pack(pady=5)
+        listbox = tk.Listbox(popup, width=40, height=10)
+        listbox.pack(padx=10, pady=5)
+        matches = []
+
+        def update_matches(*args):
+            matches[:] = self.students.search(query.get(), SEARCH_LIMIT)
+            listbox.delete(0, tk.END)
+            for row in matches:
+                listbox.insert(tk.END, f"{self.students.ids[row]} - {self.students.names[row]}")
+            if matches:
+                listbox.selection_set(0)
+
+        def show_selected(event=None):
+            if not matches:
+                return
+            sel = listbox.curselection()
+            student = self.students[matches[sel[0] if sel else 0]]
             self.text.delete(1.0, tk.END)
             self.display_student(student)
             popup.destroy()
 
+        query.trace_add("write", update_matches)
+        entry.bind("<Return>", show_selected)
+        listbox.bind("<Double-Button-1>", show_selected)
+        update_matches()
+        entry.focus_set()
+
         tk.Button(popup, text="Show", command=show_selected).pack(pady=5)
 
     def highest_student(self):
+        self.show_text()
         self.text.delete(1.0, tk.END)
-        s = get_highest_student(self.students)
+        if not self.students:
+            return
+        s = get_highest_student(self.stats)
         self.display_student(s)
 
     def lowest_student(self):
+        self.show_text()
         self.text.delete(1.0, tk.END)
-        s = get_lowest_student(self.students)
+        if not self.students:
+            return
+        s = get_lowest_student(self.stats)
         self.display_student(s)
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = StudentManager(root)
+    app = StudentManager(root, sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
\ No newline at end of file
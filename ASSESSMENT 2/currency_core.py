@@ -0,0 +1,1323 @@
+import os
+import sys
+import csv
+import json
+import math
+import mmap
+import struct
+import bisect
+import functools
+import tempfile
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_EVEN, localcontext
+from itertools import islice
+from collections import deque, Counter
+from contextlib import contextmanager
+
+# Headless core of the currency converter: rate client, caches and conversion
+# math, with no tkinter or PIL. Heavy or rarely needed modules (requests,
+# asyncio, http.server, ...) are imported inside the functions that use them,
+# so importing this module for rates alone stays cheap.
+
+SCRIPT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_FILE = os.path.join(SCRIPT_FOLDER, "rates_snapshot.json")
+HISTORY_FILE = os.path.join(SCRIPT_FOLDER, "conversion_history.log")
+RATE_HISTORY_DIR = os.path.join(SCRIPT_FOLDER, "rate_history")
+DEFAULT_UPSTREAM = "https://open.er-api.com/v6/latest/"
+
+# -----------------------------
+# PERFORMANCE COUNTERS
+# -----------------------------
+class PerfStats:
+    """Call counts and wall-clock timings for the hot paths.
+
+    Shown in the Stats window and dumped by --profile. Recording is a couple
+    of perf_counter calls and a dict update, cheap enough to leave on.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            entry = self.timings.get(name)
+            if entry is None:
+                entry = self.timings[name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def report(self):
+        with self._lock:
+            timings = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)
+            counters = sorted(self.counters.items())
+        lines = [f"{'timer':<34}{'calls':>8}{'total ms':>11}{'mean ms':>10}{'max ms':>10}"]
+        for name, (calls, total, longest) in timings:
+            lines.append(f"{name:<34}{calls:>8}{total * 1000:>11.1f}{total / calls * 1000:>10.3f}{longest * 1000:>10.2f}")
+        if counters:
+            lines.append("")
+            lines.extend(f"{name:<34}{value:>8}" for name, value in counters)
+        return "\n".join(lines)
+
+PERF = PerfStats()
+
+# -----------------------------
+# CURRENCY NAMES & SEARCH
+# -----------------------------
+# The API only returns codes; names make the full list searchable
+CURRENCY_NAMES = {
+    "AED": "United Arab Emirates Dirham",
+    "AFN": "Afghan Afghani",
+    "ALL": "Albanian Lek",
+    "AMD": "Armenian Dram",
+    "ANG": "Netherlands Antillean Guilder",
+    "AOA": "Angolan Kwanza",
+    "ARS": "Argentine Peso",
+    "AUD": "Australian Dollar",
+    "AWG": "Aruban Florin",
+    "AZN": "Azerbaijani Manat",
+    "BAM": "Bosnia-Herzegovina Convertible Mark",
+    "BBD": "Barbadian Dollar",
+    "BDT": "Bangladeshi Taka",
+    "BGN": "Bulgarian Lev",
+    "BHD": "Bahraini Dinar",
+    "BIF": "Burundian Franc",
+    "BMD": "Bermudian Dollar",
+    "BND": "Brunei Dollar",
+    "BOB": "Bolivian Boliviano",
+    "BRL": "Brazilian Real",
+    "BSD": "Bahamian Dollar",
+    "BTN": "Bhutanese Ngultrum",
+    "BWP": "Botswana Pula",
+    "BYN": "Belarusian Ruble",
+    "BZD": "Belize Dollar",
+    "CAD": "Canadian Dollar",
+    "CDF": "Congolese Franc",
+    "CHF": "Swiss Franc",
+    "CLP": "Chilean Peso",
+    "CNY": "Chinese Yuan",
+    "COP": "Colombian Peso",
+    "CRC": "Costa Rican Colon",
+    "CUP": "Cuban Peso",
+    "CVE": "Cape Verdean Escudo",
+    "CZK": "Czech Koruna",
+    "DJF": "Djiboutian Franc",
+    "DKK": "Danish Krone",
+    "DOP": "Dominican Peso",
+    "DZD": "Algerian Dinar",
+    "EGP": "Egyptian Pound",
+    "ERN": "Eritrean Nakfa",
+    "ETB": "Ethiopian Birr",
+    "EUR": "Euro",
+    "FJD": "Fijian Dollar",
+    "FKP": "Falkland Islands Pound",
+    "FOK": "Faroese Krona",
+    "GBP": "British Pound Sterling",
+    "GEL": "Georgian Lari",
+    "GGP": "Guernsey Pound",
+    "GHS": "Ghanaian Cedi",
+    "GIP": "Gibraltar Pound",
+    "GMD": "Gambian Dalasi",
+    "GNF": "Guinean Franc",
+    "GTQ": "Guatemalan Quetzal",
+    "GYD": "Guyanese Dollar",
+    "HKD": "Hong Kong Dollar",
+    "HNL": "Honduran Lempira",
+    "HRK": "Croatian Kuna",
+    "HTG": "Haitian Gourde",
+    "HUF": "Hungarian Forint",
+    "IDR": "Indonesian Rupiah",
+    "ILS": "Israeli New Shekel",
+    "IMP": "Manx Pound",
+    "INR": "Indian Rupee",
+    "IQD": "Iraqi Dinar",
+    "IRR": "Iranian Rial",
+    "ISK": "Icelandic Krona",
+    "JEP": "Jersey Pound",
+    "JMD": "Jamaican Dollar",
+    "JOD": "Jordanian Dinar",
+    "JPY": "Japanese Yen",
+    "KES": "Kenyan Shilling",
+    "KGS": "Kyrgyzstani Som",
+    "KHR": "Cambodian Riel",
+    "KID": "Kiribati Dollar",
+    "KMF": "Comorian Franc",
+    "KRW": "South Korean Won",
+    "KWD": "Kuwaiti Dinar",
+    "KYD": "Cayman Islands Dollar",
+    "KZT": "Kazakhstani Tenge",
+    "LAK": "Lao Kip",
+    "LBP": "Lebanese Pound",
+    "LKR": "Sri Lankan Rupee",
+    "LRD": "Liberian Dollar",
+    "LSL": "Lesotho Loti",
+    "LYD": "Libyan Dinar",
+    "MAD": "Moroccan Dirham",
+    "MDL": "Moldovan Leu",
+    "MGA": "Malagasy Ariary",
+    "MKD": "Macedonian Denar",
+    "MMK": "Myanmar Kyat",
+    "MNT": "Mongolian Tugrik",
+    "MOP": "Macanese Pataca",
+    "MRU": "Mauritanian Ouguiya",
+    "MUR": "Mauritian Rupee",
+    "MVR": "Maldivian Rufiyaa",
+    "MWK": "Malawian Kwacha",
+    "MXN": "Mexican Peso",
+    "MYR": "Malaysian Ringgit",
+    "MZN": "Mozambican Metical",
+    "NAD": "Namibian Dollar",
+    "NGN": "Nigerian Naira",
+    "NIO": "Nicaraguan Cordoba",
+    "NOK": "Norwegian Krone",
+    "NPR": "Nepalese Rupee",
+    "NZD": "New Zealand Dollar",
+    "OMR": "Omani Rial",
+    "PAB": "Panamanian Balboa",
+    "PEN": "Peruvian Sol",
+    "PGK": "Papua New Guinean Kina",
+    "PHP": "Philippine Peso",
+    "PKR": "Pakistani Rupee",
+    "PLN": "Polish Zloty",
+    "PYG": "Paraguayan Guarani",
+    "QAR": "Qatari Riyal",
+    "RON": "Romanian Leu",
+    "RSD": "Serbian Dinar",
+    "RUB": "Russian Ruble",
+    "RWF": "Rwandan Franc",
+    "SAR": "Saudi Riyal",
+    "SBD": "Solomon Islands Dollar",
+    "SCR": "Seychellois Rupee",
+    "SDG": "Sudanese Pound",
+    "SEK": "Swedish Krona",
+    "SGD": "Singapore Dollar",
+    "SHP": "Saint Helena Pound",
+    "SLE": "Sierra Leonean Leone",
+    "SLL": "Sierra Leonean Leone (old)",
+    "SOS": "Somali Shilling",
+    "SRD": "Surinamese Dollar",
+    "SSP": "South Sudanese Pound",
+    "STN": "Sao Tome and Principe Dobra",
+    "SYP": "Syrian Pound",
+    "SZL": "Eswatini Lilangeni",
+    "THB": "Thai Baht",
+    "TJS": "Tajikistani Somoni",
+    "TMT": "Turkmenistani Manat",
+    "TND": "Tunisian Dinar",
+    "TOP": "Tongan Paanga",
+    "TRY": "Turkish Lira",
+    "TTD": "Trinidad and Tobago Dollar",
+    "TVD": "Tuvaluan Dollar",
+    "TWD": "New Taiwan Dollar",
+    "TZS": "Tanzanian Shilling",
+    "UAH": "Ukrainian Hryvnia",
+    "UGX": "Ugandan Shilling",
+    "USD": "United States Dollar",
+    "UYU": "Uruguayan Peso",
+    "UZS": "Uzbekistani Som",
+    "VES": "Venezuelan Bolivar",
+    "VND": "Vietnamese Dong",
+    "VUV": "Vanuatu Vatu",
+    "WST": "Samoan Tala",
+    "XAF": "Central African CFA Franc",
+    "XCD": "East Caribbean Dollar",
+    "XCG": "Caribbean Guilder",
+    "XDR": "IMF Special Drawing Rights",
+    "XOF": "West African CFA Franc",
+    "XPF": "CFP Franc",
+    "YER": "Yemeni Rial",
+    "ZAR": "South African Rand",
+    "ZMW": "Zambian Kwacha",
+    "ZWL": "Zimbabwean Dollar",
+}
+
+class CurrencyIndex:
+    """Prefix index over currency codes and the words of their names.
+
+    Every prefix of every word maps to the set of codes it can match, so a
+    search is a dict lookup per query word. A query that extends the previous
+    one only filters the previous (already narrowed) result.
+    """
+
+    def __init__(self, codes):
+        self.codes = sorted(codes)
+        self._prefixes = {}
+        for code in self.codes:
+            for word in [code] + CURRENCY_NAMES.get(code, "").replace("-", " ").split():
+                word = word.lower()
+                for i in range(1, len(word) + 1):
+                    self._prefixes.setdefault(word[:i], set()).add(code)
+        self._last_query = ""
+        self._last_result = self.codes
+
+    def search(self, query):
+        query = query.lower()
+        words = query.split()
+        if not words:
+            result = self.codes
+        else:
+            candidates = self._last_result if self._last_query and query.startswith(self._last_query) else self.codes
+            matches = set.intersection(*(self._prefixes.get(word, set()) for word in words))
+            result = [code for code in candidates if code in matches]
+        self._last_query, self._last_result = query, result
+        return result
+
+# -----------------------------
+# MONEY (EXACT MINOR UNITS)
+# -----------------------------
+# ISO 4217 currencies whose minor unit is not the usual 2 decimal places
+MINOR_UNITS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+}
+
+# Exact cross rates are held as integers scaled by this factor (12 decimal places)
+RATE_SCALE = 10 ** 12
+
+def minor_units(code):
+    return MINOR_UNITS.get(code, 2)
+
+def to_minor(amount, code):
+    """Parses amount (str, int or Decimal) into an integer count of code's minor units, rounding half-even."""
+    value = Decimal(str(amount).strip()).scaleb(minor_units(code))
+    return int(value.to_integral_value(rounding=ROUND_HALF_EVEN))
+
+def from_minor(value, code):
+    return Decimal(value).scaleb(-minor_units(code))
+
+def div_round_half_even(n, d):
+    q, r = divmod(n, d)
+    if 2 * r > d or (2 * r == d and q % 2):
+        q += 1
+    return q
+
+# -----------------------------
+# RATE HISTORY STORE
+# -----------------------------
+class RecordTimes:
+    """Read-only sequence view of the record timestamps in a mapped history file (for bisect)."""
+
+    def __init__(self, mm, offset, record_size, count):
+        self.mm = mm
+        self.offset = offset
+        self.record_size = record_size
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return struct.unpack_from("<d", self.mm, self.offset + i * self.record_size)[0]
+
+class RateHistoryStore:
+    """Append-only time series of fetched rate tables, one binary file per base currency.
+
+    Layout: the magic bytes, a uint32 column count and one 3-letter code per
+    column (padded to 8 bytes), then fixed-width records of a float64
+    timestamp followed by one float64 rate per column (NaN if missing).
+    Records are appended in time order, so queries binary-search the
+    memory-mapped file and only touch the records they return. A table with
+    currencies the header lacks rewrites the file once with the wider header
+    (older records get NaN for the new columns).
+    """
+
+    MAGIC = b"RATEHIS1"
+
+    def __init__(self, folder=RATE_HISTORY_DIR):
+        self.folder = folder
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def path(self, base):
+        return os.path.join(self.folder, f"{base}.bin")
+
+    def append(self, base, timestamp, rates):
+        """Appends one table; ignored if it is not newer than the last stored record."""
+        with self._lock:
+            path = self.path(base)
+            header = self._read_header(base)
+            codes = {c for c in rates if len(c) == 3 and c.isascii()}
+            if header is None:
+                os.makedirs(self.folder, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(self._header_bytes(sorted(codes)))
+                header = self._read_header(base)
+            elif not codes <= set(header[0]):
+                header = self._widen(base, header, sorted(codes | set(header[0])))
+
+            columns, offset, record_size = header
+            size = os.path.getsize(path)
+            count = (size - offset) // record_size
+            if count:
+                with open(path, "rb") as f:
+                    f.seek(offset + (count - 1) * record_size)
+                    last_time = struct.unpack("<d", f.read(8))[0]
+                if timestamp <= last_time:
+                    return False
+
+            record = struct.pack(f"<{len(columns) + 1}d", timestamp, *(rates.get(c, math.nan) for c in columns))
+            with open(path, "ab") as f:
+                # Drop any torn partial record left by an interrupted write
+                f.truncate(offset + count * record_size)
+                f.write(record)
+            return True
+
+    def _header_bytes(self, columns):
+        header = self.MAGIC + struct.pack("<I", len(columns)) + b"".join(c.encode("ascii") for c in columns)
+        return header + b"\0" * (-len(header) % 8)
+
+    def _widen(self, base, header, columns):
+        """Rewrites base's file with columns, copying every record across; returns the new header."""
+        old_columns, offset, record_size = header
+        positions = {c: i + 1 for i, c in enumerate(old_columns)}
+        path = self.path(base)
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, prefix=f".{base}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(self._header_bytes(columns))
+                record = struct.Struct(f"<{len(columns) + 1}d")
+                for values in struct.iter_unpack(f"<{len(old_columns) + 1}d", data[:len(data) - len(data) % record_size]):
+                    out.write(record.pack(values[0], *(values[positions[c]] if c in positions else math.nan for c in columns)))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._columns.pop(base, None)
+        return self._read_header(base)
+
+    def currencies(self, base):
+        header = self._read_header(base)
+        return header[0] if header else []
+
+    def pair_history(self, base, from_code, to_code, start=None, end=None, max_points=None):
+        """[(timestamp, rate)] for from_code->to_code between start and end (inclusive).
+
+        With max_points the range is sampled evenly, so drawing a long history
+        reads about max_points records rather than the whole file.
+        """
+        header = self._read_header(base)
+        if header is None:
+            return []
+        columns, offset, record_size = header
+        if from_code not in columns or to_code not in columns:
+            return []
+        from_pos = 8 * (columns.index(from_code) + 1)
+        to_pos = 8 * (columns.index(to_code) + 1)
+
+        with open(self.path(base), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            count = (size - offset) // record_size
+            if count == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                times = RecordTimes(mm, offset, record_size, count)
+                lo = 0 if start is None else bisect.bisect_left(times, start)
+                hi = count if end is None else bisect.bisect_right(times, end)
+                step = max(1, (hi - lo) // max_points) if max_points else 1
+
+                points = []
+                for i in range(lo, hi, step):
+                    record = offset + i * record_size
+                    from_rate = struct.unpack_from("<d", mm, record + from_pos)[0]
+                    to_rate = struct.unpack_from("<d", mm, record + to_pos)[0]
+                    if from_rate and not math.isnan(from_rate) and not math.isnan(to_rate):
+                        points.append((times[i], to_rate / from_rate))
+                return points
+
+    def _read_header(self, base):
+        """(columns, records offset, record size) for base's file, or None if there is none yet."""
+        if base in self._columns:
+            return self._columns[base]
+        try:
+            with open(self.path(base), "rb") as f:
+                head = f.read(12)
+                if len(head) < 12 or head[:8] != self.MAGIC:
+                    return None
+                ncols = struct.unpack("<I", head[8:])[0]
+                codes = f.read(3 * ncols)
+        except OSError:
+            return None
+        columns = [codes[i:i + 3].decode("ascii") for i in range(0, len(codes), 3)]
+        offset = 12 + 3 * ncols
+        offset += -offset % 8
+        header = self._columns[base] = (columns, offset, 8 * (ncols + 1))
+        return header
+
+# -----------------------------
+# UPSTREAM SCHEDULING
+# -----------------------------
+class TokenBucket:
+    """Thread-safe token bucket: bursts of up to capacity calls, refilled at rate tokens per second."""
+
+    def __init__(self, capacity=10, rate=0.2):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self):
+        """Takes a token and returns 0, or returns the seconds until one is available (taking nothing)."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._tokens >= 1
+
+class Flight:
+    """One in-progress upstream fetch that other callers for the same base can wait on."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+# -----------------------------
+# API HANDLER (KEYLESS VERSION)
+# -----------------------------
+class CurrencyAPI:
+    def __init__(self, cache_ttl=3600, pivot="USD", snapshot_path=None, history_store=None,
+                 base_url=DEFAULT_UPSTREAM, rate_limit=None, preload=True):
+        # Using ExchangeRate-API (No key required for latest rates)
+        self.base_url = base_url
+
+        # Created on first use, so requests is only imported once the network is needed
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        # Every pair is derived from this one table, so changing or swapping
+        # currencies never needs another request
+        self.pivot = pivot
+
+        # Each response carries every rate for its base, so whole tables are
+        # cached per base currency: {base: {"rates": {...}, "fetched": t, "expires": t}}
+        # plus the ETag / Last-Modified validators used to revalidate them
+        self.cache_ttl = cache_ttl
+        self._cache = {}
+
+        # Last fetched tables are kept on disk so the app starts warm and
+        # keeps converting from the last known rates while offline
+        self.snapshot_path = snapshot_path
+        self._snapshot_lock = threading.Lock()
+        if snapshot_path and preload:
+            self.load_snapshot()
+
+        # Every newly published table is also appended to the rate history, if one is attached
+        self.history_store = history_store
+
+        # Upstream scheduling: concurrent fetches of one base share a single request
+        # (single flight), calls are paced by a token bucket because the free
+        # endpoint rate-limits, and usage counts decide which tables refresh first
+        self.rate_limit = rate_limit or TokenBucket()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._usage = Counter()
+        self.stats = {"upstream": 0, "coalesced": 0, "throttled": 0}
+
+        # Scaled-integer pair rates for the exact path, rebuilt when the pivot table changes
+        self._exact_rates = {}
+        self._exact_table = None
+
+    @property
+    def session(self):
+        """One keep-alive session for every request: connections are pooled and
+        transient failures (including rate limiting) are retried with backoff."""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=frozenset(["GET"]))
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def get_rates(self, base):
+        """Returns the full rate table for base, only hitting the network once the cached copy expires."""
+        self._usage[base] += 1
+        entry = self._cache.get(base)
+        if entry is not None and time.time() < entry["expires"]:
+            PERF.count("rates.cache_hit")
+            return entry["rates"]
+        PERF.count("rates.cache_miss")
+
+        try:
+            return self.refresh(base)
+        except Exception:
+            if entry is None:
+                raise
+            # Offline: keep serving the last known (now stale) table
+            return entry["rates"]
+
+    def refresh(self, base=None):
+        """Fetches base (the pivot by default) unconditionally and stores it.
+
+        If a fetch of the same base is already running, waits for that one
+        and shares its result instead of sending a second request.
+        """
+        base = base or self.pivot
+        with self._inflight_lock:
+            flight = self._inflight.get(base)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[base] = Flight()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = self._refresh_now(base)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[base]
+            flight.done.set()
+
+    def refresh_due(self):
+        """Refreshes expired tables, most-used bases first, until the rate limit runs out.
+
+        Returns the bases that were refreshed.
+        """
+        now = time.time()
+        due = [base for base, entry in list(self._cache.items()) if entry["expires"] <= now]
+        due.sort(key=lambda base: self._usage[base], reverse=True)
+        refreshed = []
+        for base in due:
+            if not self.rate_limit.available():
+                break
+            try:
+                self.refresh(base)
+            except Exception:
+                continue
+            refreshed.append(base)
+        return refreshed
+
+    def _refresh_now(self, base):
+        cached = self._cache.get(base)
+        while True:
+            wait = self.rate_limit.take()
+            if not wait:
+                break
+            with self._inflight_lock:
+                self.stats["throttled"] += 1
+            # With a table to fall back on, don't queue behind the limit
+            if cached is not None:
+                raise Exception(f"Rate limited: next request allowed in {wait:.0f}s")
+            time.sleep(wait)
+
+        with self._inflight_lock:
+            self.stats["upstream"] += 1
+        entry = self._fetch(base, cached)
+        self._evict_expired()
+        self._cache[base] = entry
+        self.save_snapshot()
+
+        # A 304 hands back the cached table itself; only record tables that are new
+        if self.history_store is not None and (cached is None or entry["rates"] is not cached["rates"]):
+            try:
+                self.history_store.append(base, entry.get("updated") or entry["fetched"], entry["rates"])
+            except OSError:
+                pass
+        return entry["rates"]
+
+    def is_stale(self, base=None):
+        entry = self._cache.get(base or self.pivot)
+        return entry is None or time.time() >= entry["expires"]
+
+    def fetched_at(self, base=None):
+        entry = self._cache.get(base or self.pivot)
+        return entry["fetched"] if entry else None
+
+    @PERF.timed("CurrencyAPI.rate")
+    def rate(self, base, target):
+        """Cross rate base->target computed from the pivot table."""
+        return self._cross_rate(self.get_rates(self.pivot), base, target)
+
+    def convert(self, amount, base, target):
+        return amount * self.rate(base, target)
+
+    def convert_many(self, rows):
+        """Converts a sequence of (amount, base, target) rows in one call.
+
+        Rows are grouped by pair so each pair's rate is worked out once from
+        the pivot table, however many rows share it.
+        """
+        table = self.get_rates(self.pivot)
+        pair_rates = {}
+        results = []
+        for amount, base, target in rows:
+            rate = pair_rates.get((base, target))
+            if rate is None:
+                rate = pair_rates[(base, target)] = self._cross_rate(table, base, target)
+            results.append(amount * rate)
+        return results
+
+    def exact_rate(self, base, target):
+        """Returns (numerator, denominator) so that target_minor = base_minor * numerator / denominator."""
+        table = self.get_rates(self.pivot)
+        if table is not self._exact_table:
+            self._exact_rates = {}
+            self._exact_table = table
+        pair = (base, target)
+        factor = self._exact_rates.get(pair)
+        if factor is None:
+            self._cross_rate(table, base, target)
+            # Work from the decimal text of the published rates, not their binary floats
+            with localcontext() as ctx:
+                ctx.prec = 28
+                ratio = Decimal(repr(table[target])) / Decimal(repr(table[base]))
+                scaled = int((ratio * RATE_SCALE).to_integral_value(rounding=ROUND_HALF_EVEN))
+            factor = (scaled * 10 ** minor_units(target), RATE_SCALE * 10 ** minor_units(base))
+            self._exact_rates[pair] = factor
+        return factor
+
+    def convert_exact(self, amount, base, target):
+        """Exact conversion of a decimal amount, rounded half-even to target's minor unit."""
+        num, den = self.exact_rate(base, target)
+        return from_minor(div_round_half_even(to_minor(amount, base) * num, den), target)
+
+    def convert_exact_many(self, rows):
+        """Batch form of convert_exact over (amount_minor, base, target) rows; returns target minor units."""
+        pair_factors = {}
+        results = []
+        for amount_minor, base, target in rows:
+            factor = pair_factors.get((base, target))
+            if factor is None:
+                factor = pair_factors[(base, target)] = self.exact_rate(base, target)
+            num, den = factor
+            q, r = divmod(amount_minor * num, den)
+            if 2 * r > den or (2 * r == den and q % 2):
+                q += 1
+            results.append(q)
+        return results
+
+    def cross_rates(self, base, allow_stale=True):
+        """{target: rate} from base for every currency, in one pass over the cached pivot table.
+
+        Returns None when there is no usable cached table; never goes to the network.
+        """
+        entry = self._cache.get(self.pivot)
+        if entry is None or (not allow_stale and time.time() >= entry["expires"]):
+            return None
+        rates = entry["rates"]
+        if base not in rates:
+            raise Exception(f"Unknown currency: {base}")
+        base_rate = rates[base]
+        return {code: rate / base_rate for code, rate in rates.items()}
+
+    def currencies(self):
+        """Codes in the cached pivot table (stale or not), without touching the network."""
+        entry = self._cache.get(self.pivot)
+        return sorted(entry["rates"]) if entry else []
+
+    def cached_rate(self, base, target, allow_stale=False):
+        """Like rate(), but returns None instead of going to the network."""
+        entry = self._cache.get(self.pivot)
+        if entry is None or (not allow_stale and time.time() >= entry["expires"]):
+            return None
+        return self._cross_rate(entry["rates"], base, target)
+
+    @PERF.timed("CurrencyAPI.get_exchange_rate")
+    def get_exchange_rate(self, base, target):
+        return self.rate(base, target)
+
+    def _cross_rate(self, rates, base, target):
+        for code in (base, target):
+            if code not in rates:
+                raise Exception(f"Unknown currency: {code}")
+        if base == target:
+            return 1.0
+        return rates[target] / rates[base]
+
+    @PERF.timed("CurrencyAPI.fetch")
+    def _fetch(self, base, cached=None):
+        # Revalidate a table we already hold, so an unchanged one costs a 304 and no parsing
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            with PERF.timer("fetch.network"):
+                response = self.session.get(f"{self.base_url}{base}", headers=headers, timeout=10)
+            if response.status_code == 304 and cached is not None:
+                PERF.count("fetch.not_modified")
+                data = None
+            else:
+                with PERF.timer("fetch.parse"):
+                    data = response.json()
+                if data.get("result") != "success":
+                    raise Exception(data.get("error-type", "Unknown API error"))
+        except Exception as e:
+            raise Exception(f"Connection failed: {e}")
+
+        fetched = time.time()
+        if data is None:
+            return dict(cached, fetched=fetched, expires=fetched + self.cache_ttl)
+
+        # The API publishes when it will next update; trust that over our own TTL
+        next_update = data.get("time_next_update_unix")
+        if isinstance(next_update, (int, float)) and next_update > fetched:
+            expires = next_update
+        else:
+            expires = fetched + self.cache_ttl
+        return {
+            "rates": data["rates"],
+            "fetched": fetched,
+            "expires": expires,
+            "updated": data.get("time_last_update_unix"),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    def _evict_expired(self):
+        # The pivot table is never evicted; it is the offline fallback
+        # Other workers may add tables meanwhile, so work from a copy of the items
+        now = time.time()
+        for base, entry in list(self._cache.items()):
+            if entry["expires"] <= now and base != self.pivot:
+                self._cache.pop(base, None)
+
+    def load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            # Tables from another rate API (e.g. a --upstream stub) are not ours to serve
+            if snapshot.get("upstream", DEFAULT_UPSTREAM) != self.base_url:
+                return
+            tables = snapshot["tables"]
+            for base, entry in tables.items():
+                # Never replace a table fetched while the snapshot was loading
+                if base in self._cache:
+                    continue
+                self._cache[base] = {
+                    "rates": entry["rates"],
+                    "fetched": entry["fetched"],
+                    "expires": entry["expires"],
+                    "updated": entry.get("updated"),
+                    "etag": entry.get("etag"),
+                    "last_modified": entry.get("last_modified"),
+                }
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or corrupt snapshot: just start cold
+            pass
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        tables = dict(self._cache)
+        folder = os.path.dirname(os.path.abspath(self.snapshot_path))
+        with self._snapshot_lock:
+            # Write to a temp file and rename so a crash never leaves a half-written snapshot
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".rates-", suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "upstream": self.base_url, "tables": tables}, f, separators=(",", ":"))
+                os.replace(tmp_path, self.snapshot_path)
+            except OSError:
+                pass
+
+# -----------------------------
+# CONVERSION HISTORY
+# -----------------------------
+class HistoryEntry:
+    __slots__ = ("time", "text")
+
+    def __init__(self, time, text):
+        self.time = time
+        self.text = text
+
+    def __str__(self):
+        return f"[{self.time:%H:%M}] {self.text}"
+
+class ConversionHistory:
+    """Keeps the most recent conversions (newest first) and appends every one to a log file.
+
+    Memory is bounded by limit; the log is the full audit trail and is written
+    batch_size entries at a time rather than once per conversion.
+    """
+
+    def __init__(self, log_path=None, limit=500, batch_size=20):
+        self.entries = deque(maxlen=limit)
+        self.log_path = log_path
+        self.batch_size = batch_size
+        self._pending = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, text):
+        entry = HistoryEntry(datetime.now(), text)
+        self.entries.appendleft(entry)
+        self._pending.append(entry)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return entry
+
+    def window(self, start, count):
+        return list(islice(self.entries, start, start + count))
+
+    def flush(self):
+        if not self._pending or not self.log_path:
+            self._pending = []
+            return
+        lines = "".join(f"{e.time.isoformat(timespec='seconds')}\t{e.text}\n" for e in self._pending)
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self._pending = []
+        except OSError:
+            # Keep the batch and try again on the next flush
+            pass
+
+# -----------------------------
+# BATCH / CSV MODE
+# -----------------------------
+def convert_csv(api, in_file, out_file, chunk_size=10000, exact=False):
+    """Streams amount,from,to rows from in_file to out_file with a converted column added.
+
+    Rows are read and converted chunk_size at a time, so memory stays bounded
+    however large the file is. With exact=True amounts are converted in integer
+    minor units and rounded to each target currency's decimals. Rows that cannot
+    be converted keep an empty result and say why in the error column.
+    Returns (converted, failed) counts.
+    """
+    reader = csv.reader(in_file)
+    writer = csv.writer(out_file)
+
+    header = next(reader, None)
+    if header is None:
+        return 0, 0
+    columns = [h.strip().lower() for h in header]
+    try:
+        amount_col, from_col, to_col = (columns.index(name) for name in ("amount", "from", "to"))
+    except ValueError:
+        raise ValueError("CSV header must contain amount, from and to columns")
+
+    # Without a rate table nothing can be converted, so stop before writing anything
+    try:
+        api.get_rates(api.pivot)
+    except Exception as e:
+        raise Exception(f"No exchange rates available: {e}")
+    writer.writerow(header + ["converted", "error"])
+
+    converted = failed = 0
+    pair_errors = {}  # (base, target) -> None once checked, or why it cannot be converted
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            break
+
+        # Parse the chunk first, then convert every valid row in one batch call
+        valid, errors = [], {}
+        for i, row in enumerate(chunk):
+            try:
+                base, target = row[from_col].strip().upper(), row[to_col].strip().upper()
+                amount = to_minor(row[amount_col], base) if exact else float(row[amount_col])
+                if not exact and not math.isfinite(amount):
+                    raise ValueError(amount)
+                pair = (base, target)
+                if pair not in pair_errors:
+                    try:
+                        api.rate(base, target)
+                        pair_errors[pair] = None
+                    except Exception as e:
+                        pair_errors[pair] = str(e)
+                if pair_errors[pair] is not None:
+                    raise Exception(pair_errors[pair])
+                valid.append((i, (amount, base, target)))
+            except IndexError:
+                errors[i] = "missing column"
+            except (ValueError, ArithmeticError):
+                errors[i] = "invalid amount"
+            except Exception as e:
+                errors[i] = str(e)
+
+        if not valid:
+            values = []
+        elif exact:
+            values = [from_minor(m, r[2]) for m, (_, r) in zip(api.convert_exact_many(r for _, r in valid), valid)]
+        else:
+            values = [f"{v:.{minor_units(r[2])}f}" for v, (_, r) in zip(api.convert_many(r for _, r in valid), valid)]
+        results = dict(zip((i for i, _ in valid), values))
+        for i, row in enumerate(chunk):
+            if i in results:
+                writer.writerow(row + [results[i], ""])
+            else:
+                writer.writerow(row + ["", errors[i]])
+        converted += len(results)
+        failed += len(errors)
+    return converted, failed
+
+# -----------------------------
+# HEADLESS HTTP SERVICE
+# -----------------------------
+class RateService:
+    """Serves /convert and /rates over local HTTP from one shared CurrencyAPI cache.
+
+    Requests that arrive while the pivot table is being fetched all wait on
+    that single upstream request (CurrencyAPI.refresh's single flight)
+    instead of starting their own.
+
+        GET /convert?amount=10&from=USD&to=EUR
+        GET /rates?base=EUR
+    """
+
+    def __init__(self, api):
+        self.api = api
+
+    async def pivot_table(self):
+        import asyncio
+
+        base = self.api.pivot
+        if not self.api.is_stale(base):
+            return
+        fetch = asyncio.get_running_loop().run_in_executor(None, self.api.get_rates, base)
+        # Shielded so a client disconnecting never abandons a fetch others may be sharing
+        await asyncio.shield(fetch)
+
+    async def handle(self, reader, writer):
+        import asyncio
+
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+            method, target = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ")[:2]
+            if method != "GET":
+                status, body = 405, {"error": "Only GET is supported"}
+            else:
+                status, body = await self.route(target)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError):
+            status, body = 400, {"error": "Malformed request"}
+
+        payload = json.dumps(body).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 502: "Bad Gateway"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def route(self, target):
+        from urllib.parse import urlsplit, parse_qs
+
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path not in ("/convert", "/rates"):
+            return 404, {"error": f"Unknown path {url.path}"}
+
+        try:
+            await self.pivot_table()
+        except Exception as e:
+            # Only reached with no cached table at all; otherwise the last known rates are served
+            return 502, {"error": str(e)}
+        meta = {"stale": self.api.is_stale(), "fetched": self.api.fetched_at()}
+
+        try:
+            if url.path == "/rates":
+                base = params.get("base", self.api.pivot).upper()
+                return 200, dict(base=base, rates=self.api.cross_rates(base), **meta)
+
+            amount = float(params["amount"])
+            if not math.isfinite(amount):
+                raise ValueError(amount)
+            base, target = params["from"].upper(), params["to"].upper()
+            rate = self.api.cached_rate(base, target, allow_stale=True)
+            body = {"amount": amount, "from": base, "to": target, "rate": rate, "result": amount * rate}
+            body.update(meta)
+            return 200, body
+        except KeyError as e:
+            return 400, {"error": f"Missing parameter {e}"}
+        except ValueError:
+            return 400, {"error": "Invalid amount"}
+        except Exception as e:
+            return 400, {"error": str(e)}
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        import asyncio
+
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving rates on http://{host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+# -----------------------------
+# BENCHMARKS
+# -----------------------------
+def start_stub_server(rates):
+    """Serves rates like the rate API (with ETag revalidation) on a free local port; returns (server, base_url).
+
+    server.counts tallies the TCP connections, requests and 304 replies it has seen.
+    """
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class StubRateHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            self.server.count("connections")
+
+        def do_GET(self):
+            self.server.count("requests")
+            body, etag = self.server.body, self.server.etag
+            if self.headers.get("If-None-Match") == etag:
+                self.server.count("not_modified")
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRateHandler)
+    server.body = json.dumps({"result": "success", "rates": rates}).encode("utf-8")
+    server.etag = f'"{len(server.body):x}-{abs(hash(server.body)):x}"'
+    server.counts = Counter()
+    lock = threading.Lock()
+
+    def count(name):
+        with lock:
+            server.counts[name] += 1
+    server.count = count
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v6/latest/"
+
+def bench_rates(seed=42):
+    """A reproducible rate table covering every known currency, for the stub server."""
+    import random
+
+    rng = random.Random(seed)
+    rates = {code: round(rng.uniform(0.2, 200), 6) for code in sorted(CURRENCY_NAMES)}
+    rates["USD"] = 1
+    return rates
+
+class BenchSuite:
+    """The benchmark workloads, run against the rate server at base_url.
+
+    tests/test_benchmarks.py times each method with pytest's benchmark
+    fixture; run_benchmarks (--bench) times the same methods with timeit.
+    """
+
+    def __init__(self, base_url, rows=200000, seed=42):
+        import random
+
+        rng = random.Random(seed)
+        self.codes = sorted(CURRENCY_NAMES)
+        self.api = CurrencyAPI(base_url=base_url, rate_limit=TokenBucket(capacity=10 ** 9, rate=10 ** 9))
+        pairs = [(rng.choice(self.codes), rng.choice(self.codes)) for _ in range(rows)]
+        self.float_rows = [(rng.randint(1, 10 ** 7) / 100, b, t) for b, t in pairs]
+        self.exact_rows = [(to_minor(a, b), b, t) for a, b, t in self.float_rows]
+        self.single_rows = self.float_rows[:10000]
+        self.queries = ["u", "us", "usd", "d", "do", "dollar", "e", "eu", "euro", "sw fr", ""] * 100
+        self.index = CurrencyIndex(self.codes)
+
+    def fetch(self):
+        return self.api.refresh()
+
+    def convert_single(self):
+        return [self.api.convert(*row) for row in self.single_rows]
+
+    def convert_batch(self):
+        return self.api.convert_many(self.float_rows)
+
+    def convert_exact_batch(self):
+        return self.api.convert_exact_many(self.exact_rows)
+
+    def build_index(self):
+        return CurrencyIndex(self.codes)
+
+    def search(self):
+        return [self.index.search(q) for q in self.queries]
+
+def run_benchmarks(rows=200000, out_path=None):
+    """Times startup, fetching and conversion throughput against a local stub rate server.
+
+    Nothing here touches Tk or the public API, so it runs anywhere. Results
+    are printed and, with out_path, saved as JSON to compare between runs.
+    """
+    import subprocess
+    import timeit
+
+    server, base_url = start_stub_server(bench_rates())
+    results = {}
+
+    def record(name, seconds, ops=1):
+        results[name] = {"seconds": seconds, "ops_per_sec": ops / seconds if seconds else float("inf")}
+
+    try:
+        # Cold imports in a fresh interpreter: the headless core alone, then the whole GUI module
+        for module in ("currency_core", "currencyconverter"):
+            code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+            output = subprocess.run([sys.executable, "-c", code], cwd=SCRIPT_FOLDER, capture_output=True, text=True)
+            if output.returncode == 0:
+                record(f"import {module}", float(output.stdout.strip()))
+
+        suite = BenchSuite(base_url, rows)
+        start = time.perf_counter()
+        suite.fetch()
+        record("cold fetch", time.perf_counter() - start)
+        record("revalidate (304)", min(timeit.repeat(suite.fetch, number=20, repeat=3)), 20)
+
+        for name, func, ops in [
+            ("cached convert", suite.convert_single, len(suite.single_rows)),
+            ("batch float", suite.convert_batch, rows),
+            ("batch exact", suite.convert_exact_batch, rows),
+            ("index build", suite.build_index, 1),
+            ("currency search", suite.search, len(suite.queries)),
+        ]:
+            record(name, min(timeit.repeat(func, number=1, repeat=3)), ops)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{'benchmark':<26}{'ops/s':>14}{'time':>14}")
+    for name, result in results.items():
+        print(f"{name:<26}{result['ops_per_sec']:>14,.0f}{result['seconds'] * 1000:>12.2f}ms")
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+# -----------------------------
+# COMMAND LINE
+# -----------------------------
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Global Currency Converter")
+    parser.add_argument("--csv", nargs=2, metavar=("INPUT", "OUTPUT"),
+                        help="convert a CSV of amount,from,to rows without opening the window ('-' for stdin/stdout)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows converted per batch in --csv mode")
+    parser.add_argument("--exact", action="store_true", help="in --csv mode, convert in exact minor units instead of floats")
+    parser.add_argument("--bench", action="store_true", help="run the benchmark suite against a local stub server and exit")
+    parser.add_argument("--bench-out", metavar="FILE", help="also save --bench results as JSON")
+    parser.add_argument("--profile", action="store_true", help="print hot-path timings and counters on exit")
+    parser.add_argument("--serve", action="store_true", help="run the headless /convert and /rates HTTP service")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve")
+    parser.add_argument("--port", type=int, default=8765, help="port for --serve")
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM,
+                        help="rate API base URL (any other than the default skips the snapshot and rate history)")
+    return parser
+
+def run_headless(args, parser):
+    """Runs --bench, --serve or --csv if one was requested; returns False when the GUI should open instead."""
+    if args.bench:
+        run_benchmarks(out_path=args.bench_out)
+        return True
+
+    # The snapshot and rate history are shared with the GUI, so only the real API may write them
+    own_upstream = args.upstream == DEFAULT_UPSTREAM
+    snapshot_path = SNAPSHOT_FILE if own_upstream else None
+
+    if args.serve:
+        import asyncio
+
+        history_store = RateHistoryStore() if own_upstream else None
+        api = CurrencyAPI(snapshot_path=snapshot_path, history_store=history_store, base_url=args.upstream)
+        try:
+            asyncio.run(RateService(api).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return True
+
+    if args.csv:
+        api = CurrencyAPI(snapshot_path=snapshot_path, base_url=args.upstream)
+        in_path, out_path = args.csv
+        in_file = sys.stdin if in_path == "-" else open(in_path, "r", newline="", encoding="utf-8")
+        out_file = sys.stdout if out_path == "-" else open(out_path, "w", newline="", encoding="utf-8")
+        try:
+            converted, failed = convert_csv(api, in_file, out_file, args.chunk_size, exact=args.exact)
+        except Exception as e:
+            parser.exit(1, f"Error: {e}\n")
+        finally:
+            if in_file is not sys.stdin:
+                in_file.close()
+            if out_file is not sys.stdout:
+                out_file.close()
+        print(f"Converted {converted} rows ({failed} failed)", file=sys.stderr)
+        return True
+
+    return False
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if not run_headless(args, parser):
+            parser.error("choose one of --csv, --serve or --bench (run currencyconverter.py for the window)")
+    finally:
+        if args.profile:
+            print(PERF.report(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
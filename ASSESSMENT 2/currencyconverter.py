@@ -1,29 +1,143 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import requests
 from datetime import datetime
-from PIL import Image, ImageTk, ImageDraw
 import os
+import sys
+import json
+import tempfile
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+from currency_core import (
+    CURRENCY_NAMES, HISTORY_FILE, PERF, SCRIPT_FOLDER, SNAPSHOT_FILE,
+    ConversionHistory, CurrencyAPI, CurrencyIndex, RateHistoryStore,
+    build_parser, minor_units, run_headless,
+)
+
+FLAG_DIR = os.path.join(SCRIPT_FOLDER, "flags")
+FLAG_SIZE = (40, 25)
+ATLAS_IMAGE = os.path.join(FLAG_DIR, ".flag_atlas.png")
+ATLAS_INDEX = os.path.join(FLAG_DIR, ".flag_atlas.json")
 
 # -----------------------------
-# API HANDLER (KEYLESS VERSION)
+# FLAG SPRITE ATLAS
 # -----------------------------
-class CurrencyAPI:
-    def __init__(self):
-        # Using ExchangeRate-API (No key required for latest rates)
-        self.base_url = "https://open.er-api.com/v6/latest/"
+# Every flag is resized once into a single PNG strip next to the sources, with
+# a JSON index of each flag's offset and source mtime. Startup only compares
+# mtimes against the index; nothing is decoded or resampled unless a flag changed.
+# PIL is only imported when an atlas or a placeholder actually has to be drawn.
+
+def flag_sources():
+    """{CODE: mtime} for every flag PNG, taken from the directory listing alone."""
+    sources = {}
+    try:
+        with os.scandir(FLAG_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".png") and not entry.name.startswith("."):
+                    sources[entry.name[:-4].upper()] = entry.stat().st_mtime
+    except OSError:
+        pass
+    return sources
+
+def load_atlas_index(sources):
+    """Returns the atlas index if it still matches the flag sources, otherwise None."""
+    try:
+        with open(ATLAS_INDEX, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if not os.path.exists(ATLAS_IMAGE) or index["size"] != list(FLAG_SIZE):
+            return None
+        if {code: flag["mtime"] for code, flag in index["flags"].items()} != sources:
+            return None
+        return index
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
-    def get_exchange_rate(self, base, target):
+def build_flag_atlas(sources):
+    """Resizes every flag into one horizontal sprite strip and writes it with its index.
+
+    Returns (index, image): image is the in-memory atlas when it could not be
+    saved (e.g. a read-only checkout), so flags can still be cropped from it;
+    None once the atlas is on disk.
+    """
+    from PIL import Image
+
+    width, height = FLAG_SIZE
+    codes = sorted(sources)
+    atlas = Image.new("RGBA", (max(len(codes), 1) * width, height))
+    flags = {}
+    for i, code in enumerate(codes):
+        x = i * width
         try:
-            response = requests.get(f"{self.base_url}{base}", timeout=10)
-            data = response.json()
-            
-            if data.get("result") == "success":
-                return data["rates"][target]
-            else:
-                raise Exception(data.get("error-type", "Unknown API error"))
-        except Exception as e:
-            raise Exception(f"Connection failed: {e}")
+            with Image.open(os.path.join(FLAG_DIR, f"{code.lower()}.png")) as img:
+                atlas.paste(img.convert("RGBA").resize(FLAG_SIZE, Image.Resampling.LANCZOS), (x, 0))
+        except OSError:
+            # Unreadable flag: recorded without an offset so it gets a placeholder
+            x = None
+        flags[code] = {"x": x, "mtime": sources[code]}
+    index = {"size": list(FLAG_SIZE), "flags": flags}
+
+    # Image first, then index, each via a temp file so readers never see a partial atlas
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=FLAG_DIR, prefix=".flag_atlas-", suffix=".png")
+        with os.fdopen(fd, "wb") as f:
+            atlas.save(f, format="PNG")
+        os.replace(tmp_path, ATLAS_IMAGE)
+        fd, tmp_path = tempfile.mkstemp(dir=FLAG_DIR, prefix=".flag_atlas-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, ATLAS_INDEX)
+    except OSError:
+        return index, atlas
+    return index, None
+
+# -----------------------------
+# BACKGROUND WORKERS
+# -----------------------------
+class DaemonExecutor:
+    """A small ThreadPoolExecutor stand-in whose workers are daemon threads.
+
+    ThreadPoolExecutor joins its workers at exit, so closing the window during
+    a slow or blackholed fetch (timeout plus retries) kept the process alive
+    for most of a minute. Daemon workers are simply dropped when Tk exits.
+    """
+
+    def __init__(self, max_workers=2):
+        self._tasks = queue.SimpleQueue()
+        self._workers = max_workers
+        for _ in range(max_workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self._tasks.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, cancel_futures=False):
+        """Stops the workers once they are idle, without waiting for running tasks."""
+        while cancel_futures:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task[0].cancel()
+        for _ in range(self._workers):
+            self._tasks.put(None)
 
 # -----------------------------
 # MAIN APPLICATION CLASS
@@ -36,40 +150,140 @@ class CurrencyConverterApp:
         self.bg_color = "#f4f4f9"
         self.root.configure(bg=self.bg_color)
 
-        self.api = CurrencyAPI()
+        # The snapshot is read on a worker thread so the window can appear first
+        self.api = CurrencyAPI(snapshot_path=SNAPSHOT_FILE, history_store=RateHistoryStore(), preload=False)
+
+        # Network requests run on worker threads; results are polled back onto
+        # the Tk main loop with root.after so the window never blocks
+        self.executor = DaemonExecutor(max_workers=2)
+        self.poll_interval = 50
+        self._request_seq = 0
+        self._refresh_future = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Variables
         self.amount_var = tk.StringVar(value="1.00")
         self.result_var = tk.StringVar(value="Select currencies and hit Convert")
         self.search_var = tk.StringVar()
+        self.from_var = tk.StringVar(value="USD")
+        self.to_var = tk.StringVar(value="EUR")
 
-        self.currencies = [
+        # Live mode recomputes from cached rates as the inputs change; history
+        # is only written once the value has settled
+        self.live_var = tk.BooleanVar(value=True)
+        self.live_delay = 200
+        self.settle_delay = 1500
+        self._live_job = None
+        self._settle_job = None
+        self._last_recorded = None
+
+        # Until a rate table is available, offer the common currencies
+        self.currencies = self.api.currencies() or [
             "USD", "EUR", "GBP", "JPY", "AUD",
             "CAD", "CHF", "CNY", "NZD", "INR", "AED", "BRL"
         ]
+        self.currency_index = CurrencyIndex(self.currencies)
+        self.filter_delay = 150
+        self._filter_job = None
         
+        # Bounded history; the full trail goes to the log file in batches
+        self.history = ConversionHistory(HISTORY_FILE)
+        self.history_rows = 6
+        self.history_offset = 0
+        self.history_flush_interval = 5000
+
+        # Matrix window state: current numbers per row, used to update only changed cells
+        self.matrix_window = None
+        self.matrix_tree = None
+        self._matrix_rows = {}
+        self._matrix_sort = None
+
         self.flag_images = {}
-        self.load_flags()
+        self._atlas = None
+        self._atlas_index = None
+        self._atlas_image = None  # the PIL atlas, kept only when it could not be saved
         self.create_widgets()
-        self.update_flags()
 
+        self.root.after(self.history_flush_interval, self.flush_history)
+        for var in (self.amount_var, self.from_var, self.to_var):
+            var.trace_add("write", self.on_input_changed)
+
+        # Flags and rates load once the window is up
+        self.root.after_idle(self.load_flags)
+        future = self.executor.submit(self.api.load_snapshot)
+        self.root.after(self.poll_interval, self.poll_snapshot, future)
+
+    def poll_snapshot(self, future):
+        if not future.done():
+            self.root.after(self.poll_interval, self.poll_snapshot, future)
+            return
+        self.update_currencies()
+        self.refresh_matrix()
+        if self.live_var.get():
+            self.live_update(fetch=False)
+
+        # Conversions already work from the snapshot; bring it up to date in the background
+        if self.api.is_stale():
+            self.refresh_rates()
+
+    @PERF.timed("App.load_flags")
     def load_flags(self):
-        """Loads images if they exist, otherwise creates colored placeholders."""
-        for code in self.currencies:
-            path = f"flags/{code.lower()}.png"
+        """Prepares lazy flag loading; the atlas is only rebuilt (in the background) when a flag file changed."""
+        sources = flag_sources()
+        self._atlas_index = load_atlas_index(sources)
+        if self._atlas_index is None:
+            future = self.executor.submit(build_flag_atlas, sources)
+            self.root.after(self.poll_interval, self.poll_flag_atlas, future)
+        else:
+            self.update_flags()
+
+    def poll_flag_atlas(self, future):
+        if not future.done():
+            self.root.after(self.poll_interval, self.poll_flag_atlas, future)
+            return
+        try:
+            self._atlas_index, self._atlas_image = future.result()
+        except Exception:
+            # Could not build the atlas at all: every flag falls back to a placeholder
+            self._atlas_index, self._atlas_image = {"size": list(FLAG_SIZE), "flags": {}}, None
+        self._atlas = None
+        self.flag_images = {}
+        self.update_flags()
+
+    def get_flag(self, code):
+        """Builds the PhotoImage for code the first time it is needed; None while the atlas is being rebuilt."""
+        image = self.flag_images.get(code)
+        if image is None and self._atlas_index is not None:
+            image = self.flag_images[code] = self.make_flag(code)
+        return image
+
+    def make_flag(self, code):
+        width, height = FLAG_SIZE
+        flag = self._atlas_index["flags"].get(code)
+        if flag and flag["x"] is not None:
             try:
-                if os.path.exists(path):
-                    img = Image.open(path).resize((40, 25), Image.Resampling.LANCZOS)
-                else:
-                    # Create a colorful placeholder so the app still looks good
-                    img = Image.new('RGB', (40, 25), color='#cccccc')
-                    draw = ImageDraw.Draw(img)
-                    draw.text((5, 5), code[:2], fill="black")
-                
-                self.flag_images[code] = ImageTk.PhotoImage(img)
-            except:
+                # Tk decodes the small atlas itself, once, and crops each flag out of it
+                if self._atlas is None:
+                    if self._atlas_image is not None:
+                        from PIL import ImageTk
+                        self._atlas = ImageTk.PhotoImage(self._atlas_image)
+                    else:
+                        self._atlas = tk.PhotoImage(file=ATLAS_IMAGE)
+                image = tk.PhotoImage(width=width, height=height)
+                image.tk.call(image, "copy", self._atlas, "-from", flag["x"], 0, flag["x"] + width, height)
+                return image
+            except tk.TclError:
                 pass
 
+        # Create a colorful placeholder so the app still looks good
+        from PIL import Image, ImageTk, ImageDraw
+
+        img = Image.new('RGB', FLAG_SIZE, color='#cccccc')
+        draw = ImageDraw.Draw(img)
+        draw.text((5, 5), code[:2], fill="black")
+        return ImageTk.PhotoImage(img)
+
+    @PERF.timed("App.create_widgets")
     def create_widgets(self):
         # Header
         tk.Label(self.root, text="Currency Converter", font=("Arial", 20, "bold"), 
@@ -91,8 +305,7 @@ class CurrencyConverterApp:
 
         # From Currency
         tk.Label(main_frame, text="From:", bg=self.bg_color).grid(row=4, column=0, sticky="w", pady=5)
-        self.from_currency = ttk.Combobox(main_frame, values=self.currencies, state="readonly")
-        self.from_currency.set("USD")
+        self.from_currency = ttk.Combobox(main_frame, textvariable=self.from_var, values=self.currencies, state="readonly")
         self.from_currency.grid(row=5, column=0, sticky="we")
         self.from_currency.bind("<<ComboboxSelected>>", lambda e: self.update_flags())
         
@@ -101,8 +314,7 @@ class CurrencyConverterApp:
 
         # To Currency
         tk.Label(main_frame, text="To:", bg=self.bg_color).grid(row=6, column=0, sticky="w", pady=5)
-        self.to_currency = ttk.Combobox(main_frame, values=self.currencies, state="readonly")
-        self.to_currency.set("EUR")
+        self.to_currency = ttk.Combobox(main_frame, textvariable=self.to_var, values=self.currencies, state="readonly")
         self.to_currency.grid(row=7, column=0, sticky="we")
         self.to_currency.bind("<<ComboboxSelected>>", lambda e: self.update_flags())
 
@@ -114,44 +326,378 @@ class CurrencyConverterApp:
         btn_frame.pack(pady=20)
 
         tk.Button(btn_frame, text="Swap ⇅", command=self.swap_currencies, width=10).pack(side="left", padx=5)
-        tk.Button(btn_frame, text="Convert", command=self.convert, bg="#4CAF50", fg="white", width=15, font=("Arial", 10, "bold")).pack(side="left", padx=5)
+        self.convert_button = tk.Button(btn_frame, text="Convert", command=self.convert, bg="#4CAF50", fg="white", width=15, font=("Arial", 10, "bold"))
+        self.convert_button.pack(side="left", padx=5)
+
+        tool_frame = tk.Frame(self.root, bg=self.bg_color)
+        tool_frame.pack()
+        tk.Button(tool_frame, text="Rate History", command=self.show_rate_chart, width=12).pack(side="left", padx=5)
+        tk.Button(tool_frame, text="All Currencies", command=self.show_matrix, width=12).pack(side="left", padx=5)
+        tk.Button(tool_frame, text="Stats", command=self.show_stats, width=8).pack(side="left", padx=5)
+        tk.Checkbutton(self.root, text="Convert as you type", variable=self.live_var, command=self.on_input_changed,
+                       bg=self.bg_color).pack()
 
         # Result display
         tk.Label(self.root, textvariable=self.result_var, font=("Arial", 14, "bold"), bg=self.bg_color, fg="#2c3e50").pack(pady=10)
 
         # History Box
         tk.Label(self.root, text="Recent Conversions:", bg=self.bg_color, font=("Arial", 10, "italic")).pack()
-        self.history_box = tk.Listbox(self.root, width=50, height=6)
-        self.history_box.pack(pady=10, padx=20)
+        # Only the visible rows are ever in the Listbox; scrolling re-renders a window of self.history
+        history_frame = tk.Frame(self.root, bg=self.bg_color)
+        history_frame.pack(pady=10, padx=20)
+        self.history_box = tk.Listbox(history_frame, width=50, height=self.history_rows)
+        self.history_box.pack(side="left")
+        self.history_scroll = tk.Scrollbar(history_frame, orient="vertical", command=self.scroll_history)
+        self.history_scroll.pack(side="left", fill="y")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.history_box.bind(sequence, self.wheel_history)
 
     def update_flags(self):
-        f_code = self.from_currency.get()
-        t_code = self.to_currency.get()
-        if f_code in self.flag_images:
-            self.from_flag_label.config(image=self.flag_images[f_code])
-        if t_code in self.flag_images:
-            self.to_flag_label.config(image=self.flag_images[t_code])
+        f_image = self.get_flag(self.from_currency.get())
+        t_image = self.get_flag(self.to_currency.get())
+        if f_image is not None:
+            self.from_flag_label.config(image=f_image)
+        if t_image is not None:
+            self.to_flag_label.config(image=t_image)
 
+    @PERF.timed("App.convert")
     def convert(self):
         try:
             amount = float(self.amount_var.get())
-            base = self.from_currency.get()
-            target = self.to_currency.get()
-            
-            rate = self.api.get_exchange_rate(base, target)
-            result = amount * rate
-            
-            res_str = f"{amount:,.2f} {base} = {result:,.2f} {target}"
-            self.result_var.set(res_str)
-
-            # Add to history
-            time_now = datetime.now().strftime("%H:%M")
-            self.history_box.insert(0, f"[{time_now}] {res_str}")
-            
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number for the amount.")
+            return
+
+        base = self.from_currency.get()
+        target = self.to_currency.get()
+        try:
+            rate = self.api.cached_rate(base, target)
+        except Exception as e:
+            messagebox.showerror("API Error", str(e))
+            return
+
+        if rate is not None:
+            self.show_conversion(amount, base, target, rate)
+            return
+
+        # Expired rates are shown straight away (marked stale) while a refresh runs
+        stale_rate = self.api.cached_rate(base, target, allow_stale=True)
+        if stale_rate is not None:
+            self.show_conversion(amount, base, target, stale_rate, stale=True)
+            self.refresh_rates()
+            return
+
+        # Not cached yet: fetch in the background and show progress meanwhile
+        self._request_seq += 1
+        self.set_busy(True)
+        future = self.executor.submit(self.api.rate, base, target)
+        self.root.after(self.poll_interval, self.poll_conversion, future, self._request_seq, amount, base, target)
+
+    def poll_conversion(self, future, seq, amount, base, target):
+        if not future.done():
+            self.root.after(self.poll_interval, self.poll_conversion, future, seq, amount, base, target)
+            return
+
+        # A newer Convert click owns the display now
+        if seq != self._request_seq:
+            return
+        self.set_busy(False)
+
+        # The user picked a different pair while this one was loading
+        if (base, target) != (self.from_currency.get(), self.to_currency.get()):
+            self.result_var.set("Select currencies and hit Convert")
+            return
+
+        try:
+            rate = future.result()
         except Exception as e:
+            self.result_var.set("Conversion failed")
             messagebox.showerror("API Error", str(e))
+            return
+        self.update_currencies()
+        # The API falls back to the last known table when the network is down
+        self.show_conversion(amount, base, target, rate, stale=self.api.is_stale())
+
+    def on_input_changed(self, *args):
+        if not self.live_var.get():
+            return
+        if self._live_job is not None:
+            self.root.after_cancel(self._live_job)
+        self._live_job = self.root.after(self.live_delay, self.live_update)
+
+    def live_update(self, fetch=True):
+        """Recomputes the result from cached rates only; the network is used only if no table is cached."""
+        self._live_job = None
+        if self._settle_job is not None:
+            self.root.after_cancel(self._settle_job)
+            self._settle_job = None
+
+        base, target = self.from_currency.get(), self.to_currency.get()
+        try:
+            amount = float(self.amount_var.get())
+        except ValueError:
+            self.result_var.set("Enter a valid amount")
+            return
+        try:
+            rate = self.api.cached_rate(base, target)
+            stale = rate is None
+            if stale:
+                rate = self.api.cached_rate(base, target, allow_stale=True)
+        except Exception as e:
+            self.result_var.set(str(e))
+            return
+
+        if stale and fetch:
+            self.refresh_rates()
+        if rate is None:
+            self.result_var.set("Fetching latest rates..." if fetch else "Rates unavailable")
+            return
+
+        res_str = self.show_conversion(amount, base, target, rate, stale=stale, record=False)
+        self._settle_job = self.root.after(self.settle_delay, self.commit_live_result, res_str)
+
+    def commit_live_result(self, res_str):
+        self._settle_job = None
+        # Don't log a settled value again if it was just recorded, e.g. by Convert
+        if res_str != self._last_recorded:
+            self.record_history(res_str)
+
+    @PERF.timed("App.show_conversion")
+    def show_conversion(self, amount, base, target, rate, stale=False, record=True):
+        result = amount * rate
+        res_str = f"{amount:,.{minor_units(base)}f} {base} = {result:,.{minor_units(target)}f} {target}"
+        if stale:
+            fetched = datetime.fromtimestamp(self.api.fetched_at()).strftime("%d %b %H:%M")
+            self.result_var.set(f"{res_str}\n(offline - rates from {fetched})")
+            res_str += " (stale)"
+        else:
+            self.result_var.set(res_str)
+
+        if record:
+            self.record_history(res_str)
+        self.refresh_matrix()
+        return res_str
+
+    def record_history(self, res_str):
+        self._last_recorded = res_str
+        self.history.add(res_str)
+        self.history_offset = 0
+        self.render_history()
+
+    @PERF.timed("App.render_history")
+    def render_history(self):
+        total = len(self.history)
+        self.history_offset = max(0, min(self.history_offset, total - self.history_rows))
+        self.history_box.delete(0, tk.END)
+        rows = self.history.window(self.history_offset, self.history_rows)
+        if rows:
+            self.history_box.insert(tk.END, *map(str, rows))
+        if total > self.history_rows:
+            self.history_scroll.set(self.history_offset / total, (self.history_offset + self.history_rows) / total)
+        else:
+            self.history_scroll.set(0, 1)
+
+    def scroll_history(self, action, amount, unit=None):
+        if action == "moveto":
+            self.history_offset = int(float(amount) * len(self.history))
+        elif unit == "pages":
+            self.history_offset += int(amount) * self.history_rows
+        else:
+            self.history_offset += int(amount)
+        self.render_history()
+
+    def wheel_history(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_history("scroll", -1)
+        else:
+            self.scroll_history("scroll", 1)
+        return "break"
+
+    def flush_history(self):
+        self.history.flush()
+        self.root.after(self.history_flush_interval, self.flush_history)
+
+    def refresh_rates(self):
+        """Refreshes the pivot table in the background; a no-op while one is already running."""
+        if self._refresh_future is not None and not self._refresh_future.done():
+            return
+        # With tables cached, refresh whichever expired (most-used first); otherwise fetch the pivot
+        task = self.api.refresh_due if self.api.fetched_at() else self.api.refresh
+        self._refresh_future = self.executor.submit(task)
+        self.root.after(self.poll_interval, self.poll_refresh)
+
+    def poll_refresh(self):
+        if not self._refresh_future.done():
+            self.root.after(self.poll_interval, self.poll_refresh)
+            return
+        self.update_currencies()
+        self.refresh_matrix()
+        if self.live_var.get():
+            self.live_update(fetch=False)
+
+    def update_currencies(self):
+        """Switches to the full currency list of the rate table once one is available."""
+        codes = self.api.currencies()
+        if not codes or codes == self.currencies:
+            return
+        self.currencies = codes
+        self.currency_index = CurrencyIndex(codes)
+        self.apply_filter()
+
+    def set_busy(self, busy):
+        if busy:
+            self.result_var.set("Fetching latest rates...")
+            self.convert_button.config(text="Converting...")
+        else:
+            self.convert_button.config(text="Convert")
+
+    def on_close(self):
+        self.history.flush()
+        self.executor.shutdown(cancel_futures=True)
+        self.root.destroy()
+
+    def show_matrix(self):
+        """Opens (or raises) a table of the amount converted into every currency."""
+        if self.matrix_window is not None and self.matrix_window.winfo_exists():
+            self.matrix_window.lift()
+            return
+
+        self.matrix_window = tk.Toplevel(self.root)
+        self.matrix_window.title("All Currencies")
+        self.matrix_window.protocol("WM_DELETE_WINDOW", self.close_matrix)
+        columns = ("code", "name", "rate", "amount")
+        frame = tk.Frame(self.matrix_window)
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.matrix_tree = ttk.Treeview(frame, columns=columns, show="headings", height=18)
+        for col, title, width in zip(columns, ("Code", "Currency", "Rate", "Amount"), (60, 220, 100, 130)):
+            self.matrix_tree.heading(col, text=title, command=lambda c=col: self.sort_matrix(c, toggle=True))
+            self.matrix_tree.column(col, width=width, anchor="w" if col in ("code", "name") else "e")
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=self.matrix_tree.yview)
+        self.matrix_tree.configure(yscrollcommand=scroll.set)
+        self.matrix_tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="left", fill="y")
+
+        self._matrix_rows = {}
+        self._matrix_sort = None
+        self.refresh_matrix()
+
+    def close_matrix(self):
+        self.matrix_window.destroy()
+        self.matrix_window = self.matrix_tree = None
+        self._matrix_rows = {}
+
+    @PERF.timed("App.refresh_matrix")
+    def refresh_matrix(self):
+        """Recomputes every conversion from the cached table and updates only the cells that changed."""
+        if self.matrix_tree is None:
+            return
+        base = self.from_currency.get()
+        try:
+            amount = float(self.amount_var.get())
+            rates = self.api.cross_rates(base)
+        except Exception:
+            return
+        if rates is None:
+            return
+        self.matrix_window.title(f"All Currencies - {amount:,.{minor_units(base)}f} {base}")
+
+        changed = False
+        for code, rate in rates.items():
+            row = (CURRENCY_NAMES.get(code, ""), rate, amount * rate)
+            old = self._matrix_rows.get(code)
+            if old == row:
+                continue
+            changed = True
+            self._matrix_rows[code] = row
+            cells = (f"{rate:.6g}", f"{row[2]:,.{minor_units(code)}f}")
+            if old is None:
+                self.matrix_tree.insert("", tk.END, iid=code, values=(code, row[0]) + cells)
+            else:
+                if old[1] != rate:
+                    self.matrix_tree.set(code, "rate", cells[0])
+                if old[2] != row[2]:
+                    self.matrix_tree.set(code, "amount", cells[1])
+        for code in [c for c in self._matrix_rows if c not in rates]:
+            del self._matrix_rows[code]
+            self.matrix_tree.delete(code)
+            changed = True
+
+        if changed and self._matrix_sort is not None:
+            self.sort_matrix(self._matrix_sort[0])
+
+    def sort_matrix(self, column, toggle=False):
+        reverse = False
+        if self._matrix_sort is not None and self._matrix_sort[0] == column:
+            reverse = self._matrix_sort[1] != toggle
+        self._matrix_sort = (column, reverse)
+
+        position = {"code": None, "name": 0, "rate": 1, "amount": 2}[column]
+        key = (lambda code: code) if position is None else (lambda code: self._matrix_rows[code][position])
+        for index, code in enumerate(sorted(self._matrix_rows, key=key, reverse=reverse)):
+            self.matrix_tree.move(code, "", index)
+
+    def show_stats(self):
+        """Shows the hot-path timings and upstream counters."""
+        window = tk.Toplevel(self.root)
+        window.title("Performance Stats")
+        text = tk.Text(window, width=76, height=24, font=("Courier", 9))
+        text.pack(padx=10, pady=10)
+
+        def refresh():
+            text.delete(1.0, tk.END)
+            text.insert(tk.END, PERF.report() + "\n\n")
+            text.insert(tk.END, "".join(f"upstream.{name:<25}{value:>8}\n" for name, value in self.api.stats.items()))
+
+        tk.Button(window, text="Refresh", command=refresh).pack(pady=(0, 10))
+        refresh()
+
+    def show_rate_chart(self):
+        """Opens a chart of the selected pair's stored rate history."""
+        window = tk.Toplevel(self.root)
+        base, target = self.from_currency.get(), self.to_currency.get()
+        window.title(f"{base} → {target} rate history")
+        window.configure(bg=self.bg_color)
+
+        ranges = {"24 hours": 86400, "7 days": 7 * 86400, "30 days": 30 * 86400, "All": None}
+        range_box = ttk.Combobox(window, values=list(ranges), state="readonly", width=12)
+        range_box.set("30 days")
+        range_box.pack(pady=5)
+        canvas = tk.Canvas(window, width=460, height=240, bg="white", highlightthickness=0)
+        canvas.pack(padx=10, pady=10)
+
+        def redraw(event=None):
+            span = ranges[range_box.get()]
+            start = time.time() - span if span else None
+            self.draw_rate_chart(canvas, base, target, start)
+
+        range_box.bind("<<ComboboxSelected>>", redraw)
+        redraw()
+
+    def draw_rate_chart(self, canvas, base, target, start):
+        canvas.delete("all")
+        width, height, pad = int(canvas["width"]), int(canvas["height"]), 40
+        # At most one point per pixel column is read from the store
+        points = self.api.history_store.pair_history(self.api.pivot, base, target, start=start, max_points=width - 2 * pad)
+        if len(points) < 2:
+            canvas.create_text(width / 2, height / 2, text="Not enough rate history yet", fill="grey")
+            return
+
+        t0, t1 = points[0][0], points[-1][0]
+        low = min(rate for _, rate in points)
+        high = max(rate for _, rate in points)
+        span = (high - low) or 1
+        coords = []
+        for t, rate in points:
+            coords.append(pad + (t - t0) / ((t1 - t0) or 1) * (width - 2 * pad))
+            coords.append(height - pad - (rate - low) / span * (height - 2 * pad))
+
+        canvas.create_line(pad, height - pad, width - pad, height - pad, fill="#999")
+        canvas.create_line(pad, pad, pad, height - pad, fill="#999")
+        canvas.create_line(*coords, fill="#4CAF50", width=2)
+        canvas.create_text(pad - 4, pad, text=f"{high:.4g}", anchor="e", font=("Arial", 8))
+        canvas.create_text(pad - 4, height - pad, text=f"{low:.4g}", anchor="e", font=("Arial", 8))
+        canvas.create_text(pad, height - pad + 12, text=datetime.fromtimestamp(t0).strftime("%d %b %H:%M"), anchor="w", font=("Arial", 8))
+        canvas.create_text(width - pad, height - pad + 12, text=datetime.fromtimestamp(t1).strftime("%d %b %H:%M"), anchor="e", font=("Arial", 8))
 
     def swap_currencies(self):
         f, t = self.from_currency.get(), self.to_currency.get()
@@ -159,13 +705,41 @@ class CurrencyConverterApp:
         self.to_currency.set(f)
         self.update_flags()
 
+        # Refresh the shown result for the swapped pair if the rates are already cached
+        try:
+            amount = float(self.amount_var.get())
+            rate = self.api.cached_rate(t, f)
+        except Exception:
+            return
+        if rate is not None:
+            self.result_var.set(f"{amount:,.{minor_units(t)}f} {t} = {amount * rate:,.{minor_units(f)}f} {f}")
+
+    @PERF.timed("App.filter_currencies")
     def filter_currencies(self, event):
-        query = self.search_var.get().upper()
-        filtered = [c for c in self.currencies if query in c]
-        self.from_currency["values"] = filtered
-        self.to_currency["values"] = filtered
+        # Debounced: only filter once typing pauses
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(self.filter_delay, self.apply_filter)
+
+    @PERF.timed("App.apply_filter")
+    def apply_filter(self):
+        self._filter_job = None
+        filtered = self.currency_index.search(self.search_var.get())
+        if list(self.from_currency["values"]) != filtered:
+            self.from_currency["values"] = filtered
+            self.to_currency["values"] = filtered
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if not run_headless(args, parser):
+            root = tk.Tk()
+            CurrencyConverterApp(root)
+            root.mainloop()
+    finally:
+        if args.profile:
+            print(PERF.report(), file=sys.stderr)
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = CurrencyConverterApp(root)
-    root.mainloop()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import importlib.util
+import os
+import sys
+import time
+
+import pytest
+
+# The apps are plain scripts rather than an installed package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_script(relative_path, name):
+    """Imports one of the exercise scripts, whose folders have spaces and cannot be packages."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    @pytest.fixture
+    def benchmark():
+        """Stand-in for pytest-benchmark's fixture: runs func a few times and returns its result.
+
+        Install pytest-benchmark for real statistics and --benchmark-compare.
+        """
+        def run(func, *args, **kwargs):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                timings.append(time.perf_counter() - start)
+            run.best = min(timings)
+            return result
+        return run
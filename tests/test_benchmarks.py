@@ -0,0 +1,60 @@
+# Throughput benchmarks against the local stub server, collected by pytest.
+# With pytest-benchmark installed, save a baseline with --benchmark-autosave
+# and catch regressions with --benchmark-compare --benchmark-compare-fail=mean:20%.
+import subprocess
+import sys
+
+import pytest
+
+from currency_core import SCRIPT_FOLDER, BenchSuite, bench_rates, from_minor, start_stub_server
+
+
+@pytest.fixture(scope="module")
+def suite():
+    server, base_url = start_stub_server(bench_rates())
+    suite = BenchSuite(base_url, rows=20000)
+    suite.server = server
+    suite.fetch()
+    yield suite
+    server.shutdown()
+    server.server_close()
+
+
+def test_revalidate(benchmark, suite):
+    rates = suite.api.get_rates(suite.api.pivot)
+    before = suite.server.counts["not_modified"]
+    assert benchmark(suite.fetch) is rates
+    assert suite.server.counts["not_modified"] > before
+
+
+def test_convert_single(benchmark, suite):
+    results = benchmark(suite.convert_single)
+    assert len(results) == len(suite.single_rows)
+
+
+def test_convert_batch(benchmark, suite):
+    results = benchmark(suite.convert_batch)
+    assert results[:100] == [suite.api.convert(*row) for row in suite.float_rows[:100]]
+
+
+def test_convert_exact_batch(benchmark, suite):
+    results = benchmark(suite.convert_exact_batch)
+    for (amount, base, target), result in list(zip(suite.exact_rows, results))[:100]:
+        assert suite.api.convert_exact(from_minor(amount, base), base, target) == from_minor(result, target)
+
+
+def test_build_index(benchmark, suite):
+    index = benchmark(suite.build_index)
+    assert index.search("usd") == ["USD"]
+
+
+def test_search(benchmark, suite):
+    results = benchmark(suite.search)
+    assert results[2] == ["USD"]
+
+
+def test_core_import_stays_light():
+    # The headless core must not pull in the GUI or network stacks at import time
+    code = "import sys, currency_core; print(sorted({'tkinter', 'PIL', 'requests', 'asyncio'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=SCRIPT_FOLDER, capture_output=True, text=True)
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,79 @@
+import asyncio
+import csv
+import io
+import time
+
+import pytest
+
+from currency_core import CurrencyAPI, RateService, TokenBucket, convert_csv, start_stub_server
+
+RATES = {"USD": 1, "EUR": 0.9, "GBP": 0.8, "JPY": 150.0}
+
+
+@pytest.fixture
+def stub():
+    server, base_url = start_stub_server(RATES)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(stub):
+    # An unlimited bucket, so back-to-back refreshes are never throttled
+    return CurrencyAPI(base_url=stub[1], rate_limit=TokenBucket(capacity=10 ** 6, rate=10 ** 6))
+
+
+def test_refreshes_reuse_one_connection(stub, api):
+    server, _ = stub
+    for _ in range(5):
+        assert api.refresh() == RATES
+    assert server.counts["requests"] == 5
+    assert server.counts["connections"] == 1
+
+
+def test_not_modified_keeps_cached_table_and_extends_expiry(stub, api):
+    server, _ = stub
+    rates = api.refresh()
+    first = api._cache["USD"]
+    time.sleep(0.01)
+
+    assert api.refresh() is rates
+    second = api._cache["USD"]
+    assert server.counts["not_modified"] == 1
+    assert second["rates"] is first["rates"]
+    assert second["etag"] == first["etag"]
+    assert second["expires"] > first["expires"]
+
+
+def test_cached_table_serves_rates_without_network(stub, api):
+    server, _ = stub
+    api.get_rates("USD")
+    for _ in range(10):
+        api.rate("EUR", "GBP")
+    assert server.counts["requests"] == 1
+    assert api.rate("EUR", "GBP") == pytest.approx(0.8 / 0.9)
+
+
+def test_csv_uses_target_decimals_and_reports_bad_rows(api):
+    rows = "amount,from,to\n10,USD,JPY\n10,USD,GBP\nnan,USD,EUR\n5,XXX,EUR\n"
+    out = io.StringIO()
+    assert convert_csv(api, io.StringIO(rows), out) == (2, 2)
+    result = list(csv.reader(io.StringIO(out.getvalue())))
+    assert result[1][3:] == ["1500", ""]
+    assert result[2][3:] == ["8.00", ""]
+    assert result[3][3:] == ["", "invalid amount"]
+    assert result[4][3:] == ["", "Unknown currency: XXX"]
+
+
+def test_service_shares_one_upstream_fetch_and_rejects_nan(stub, api):
+    server, _ = stub
+    service = RateService(api)
+
+    async def requests():
+        return await asyncio.gather(*[service.route("/convert?amount=10&from=USD&to=EUR") for _ in range(20)])
+
+    responses = asyncio.run(requests())
+    assert all(status == 200 and body["result"] == pytest.approx(9.0) for status, body in responses)
+    assert server.counts["requests"] == 1
+    assert asyncio.run(service.route("/convert?amount=nan&from=USD&to=EUR"))[0] == 400
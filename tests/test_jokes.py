@@ -0,0 +1,65 @@
+import os
+from array import array
+
+import pytest
+
+from conftest import load_script
+
+joke = load_script("ASSESSMENT 1/exercise 2 - Alexa tell me a joke/joke.py", "joke")
+
+JOKES = [f"Why did chicken {n} cross the road?To get to side {n}." for n in range(20)]
+
+
+def deal(bag, count):
+    return [bag.next() for _ in range(count)]
+
+
+def test_shuffle_bag_deals_every_number_once_per_round():
+    bag = joke.ShuffleBag(50, seed=1)
+    for _ in range(3):
+        assert sorted(deal(bag, 50)) == list(range(50))
+
+
+def test_shuffle_bag_grow_mid_round_deals_new_numbers_once():
+    bag = joke.ShuffleBag(20, seed=2)
+    told = deal(bag, 10)
+    bag.grow(30)
+    assert bag.remaining() == 20
+    told += deal(bag, 20)
+    assert sorted(told) == list(range(30))
+    assert sorted(deal(bag, 30)) == list(range(30))
+
+
+def test_shuffle_bag_reset_with_untold_finishes_the_round_first():
+    bag = joke.ShuffleBag(10, seed=3)
+    deal(bag, 4)
+    bag.reset(15, untold=[3, 5, 12])
+    assert sorted(deal(bag, 3)) == [3, 5, 12]
+    assert sorted(deal(bag, 15)) == list(range(15))
+
+
+@pytest.fixture
+def jokes_file(tmp_path):
+    path = tmp_path / "jokes.txt"
+    path.write_text("\n".join(JOKES) + "\n")
+    joke.JokeStore(str(path))
+    assert os.path.exists(joke.indexPath(str(path)))
+    return str(path)
+
+
+@pytest.mark.parametrize("damage", ["truncate", "pad"])
+def test_truncated_or_padded_index_is_rebuilt(jokes_file, damage):
+    index = joke.indexPath(jokes_file)
+    with open(index, "r+b") as file:
+        size = len(file.read())
+        if damage == "truncate":
+            file.truncate(size - 8)
+        else:
+            file.write(b"\0" * 8)
+    assert joke.loadIndex(jokes_file, os.stat(jokes_file)) is None
+
+    store = joke.JokeStore(jokes_file)
+    assert isinstance(store.offsets, array)
+    assert [store[i] for i in range(len(store))] == JOKES
+    assert os.path.getsize(index) == size
+    assert joke.loadIndex(jokes_file, os.stat(jokes_file)) is not None
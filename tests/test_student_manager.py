@@ -0,0 +1,90 @@
+import pytest
+
+from conftest import load_script
+
+app = load_script("ASSESSMENT 1/exercise 3 - Student Manager/app.py", "student_manager")
+
+SCORES = """3
+1001, Ava Williams, 13,15,17,70
+1002, Liam Thompson, 11,13,15,60
+1003, Broken Line, 11,13
+1004, Noah Brown, 20,20,20,95
+"""
+
+
+@pytest.fixture
+def scores(tmp_path):
+    path = tmp_path / "scores.txt"
+    path.write_text(SCORES)
+    students = app.read_students(str(path))
+    assert app.load_cache(str(path)) is not None
+    return str(path), students
+
+
+def block_offsets(path):
+    """Where the ID, name and error blocks start in path's cache."""
+    with open(app.cache_path(path), "rb") as f:
+        header = app.CACHE_HEADER.unpack(f.read(app.CACHE_HEADER.size))
+    count, ids_len, names_len = header[4:7]
+    ids = app.CACHE_HEADER_SIZE + 14 * count
+    return {"ids": ids, "names": ids + ids_len, "errors": ids + ids_len + names_len}
+
+
+def damage(path, block, old, new):
+    with open(app.cache_path(path), "rb") as f:
+        data = bytearray(f.read())
+    start = block_offsets(path)[block]
+    i = data.index(old, start)
+    data[i:i + len(old)] = new
+    with open(app.cache_path(path), "wb") as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize("block, old, new", [
+    ("ids", b"1", b"\xff"),  # not utf-8
+    ("names", b"\n", b" "),  # one name short
+    ("errors", b"\t", b" "),  # no line number separator
+])
+def test_damaged_text_block_is_a_miss_and_gets_rewritten(scores, block, old, new):
+    path, students = scores
+    damage(path, block, old, new)
+    assert app.load_cache(path) is None
+
+    reread = app.read_students(path)
+    assert list(reread.ids) == ["1001", "1002", "1004"]
+    assert reread.errors == students.errors
+    cached = app.load_cache(path)
+    assert cached is not None
+    assert list(cached.names) == list(students.names)
+    assert cached.errors == students.errors
+
+
+@pytest.mark.parametrize("change", [b"\0", -1])
+def test_wrong_size_cache_is_a_miss_and_gets_rewritten(scores, change):
+    path, students = scores
+    with open(app.cache_path(path), "r+b") as f:
+        data = f.read()
+        if change == -1:
+            f.truncate(len(data) - 1)
+        else:
+            f.write(change)
+    assert app.load_cache(path) is None
+
+    app.read_students(path)
+    cached = app.load_cache(path)
+    assert cached is not None
+    assert list(cached.overall) == list(students.overall)
+
+
+def test_id_repeated_across_cohorts_is_reported(tmp_path):
+    (tmp_path / "a.txt").write_text("1001, Ava Williams, 13,15,17,70\n1002, Liam Thompson, 11,13,15,60\n")
+    (tmp_path / "b.txt").write_text("1003, Noah Brown, 20,20,20,95\n1001, Mia Clark, 10,10,10,50\n")
+    # The worker function run in-process: a module loaded by path cannot be pickled for a pool
+    files = app.find_score_files(str(tmp_path))
+    students = app.merge_cohorts(files, [app.parse_cohort(f) for f in files])
+
+    assert len(students) == 4
+    assert students.find_id("1001") == 0
+    assert students.errors == [(0, "b: duplicate student ID 1001 (first in a)")]
+    assert students._index_version is None
+    assert students.search("mia") == [3]